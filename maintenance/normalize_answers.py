@@ -0,0 +1,34 @@
+import os
+
+import pymongo
+from pymongo import UpdateOne
+from rapidfuzz import utils
+
+
+def main():
+    """
+    Add a "normalizedAnswer" field to every question document that has an "answer" field but no normalized answer.
+
+    Environment variables:
+
+    * ``DATABASE`` - The name of the database to normalize the answers in
+    """
+    db_name = os.environ.get("DATABASE")
+    if not db_name:
+        raise ValueError("Environment variable 'DATABASE' not defined")
+
+    mongodb = pymongo.MongoClient(os.environ["CONNECTION_STRING"])
+    rec_question_coll = mongodb.get_database(db_name).get_collection("RecordedQuestions")
+    unrec_question_coll = mongodb.get_database(db_name).get_collection("UnrecordedQuestions")
+    query = {"answer": {"$exists": True}, "normalizedAnswer": {"$exists": False}}
+    for cltn in [rec_question_coll, unrec_question_coll]:
+        update_batch = []
+        for question in cltn.find(query, {"answer": 1}):
+            normalized_answer = utils.default_process(question["answer"])
+            update_batch.append(UpdateOne({"_id": question["_id"]}, {"$set": {"normalizedAnswer": normalized_answer}}))
+        if update_batch:
+            cltn.bulk_write(update_batch)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+import os
+from datetime import datetime
+
+import pymongo
+from pymongo import UpdateOne
+
+GAME_DATE_FORMAT = "%Y %m %d %H %M %S"
+
+
+def normalize_date(date):
+    """
+    Convert a game session date into its zero-padded form.
+
+    :param date: The date of a game session
+    :return: The normalized date, or None if the date could not be parsed
+    """
+    try:
+        return datetime.strptime(date, GAME_DATE_FORMAT).strftime(GAME_DATE_FORMAT)
+    except (TypeError, ValueError):
+        return None
+
+
+def main():
+    """
+    Zero-pad the "date" field of every game session and every session in the game history of every user, so that
+    sorting the dates as strings sorts them chronologically.
+
+    Environment variables:
+
+    * ``DATABASE`` - The name of the database to normalize the game dates in
+    """
+    db_name = os.environ.get("DATABASE")
+    if not db_name:
+        raise ValueError("Environment variable 'DATABASE' not defined")
+
+    mongodb = pymongo.MongoClient(os.environ["CONNECTION_STRING"])
+    database = mongodb.get_database(db_name)
+    game_coll = database.get_collection("Games")
+    user_coll = database.get_collection("Users")
+
+    update_batch = []
+    for game in game_coll.find({"date": {"$exists": True}}, {"date": 1}):
+        normalized_date = normalize_date(game["date"])
+        if normalized_date is None:
+            print(f"Could not parse date {game['date']!r} of game session {game['_id']!r}")
+        elif normalized_date != game["date"]:
+            update_batch.append(UpdateOne({"_id": game["_id"]}, {"$set": {"date": normalized_date}}))
+    if update_batch:
+        game_coll.bulk_write(update_batch)
+
+    update_batch = []
+    for user in user_coll.find({"history": {"$type": "array"}}, {"history": 1}):
+        history = user["history"]
+        changed = False
+        for session in history:
+            if type(session) is not dict or "date" not in session:
+                continue
+            normalized_date = normalize_date(session["date"])
+            if normalized_date is None:
+                print(f"Could not parse date {session['date']!r} in the game history of user {user['_id']!r}")
+            elif normalized_date != session["date"]:
+                session["date"] = normalized_date
+                changed = True
+        if changed:
+            history.sort(key=lambda session: session.get("date", "") if type(session) is dict else "")
+            update_batch.append(UpdateOne({"_id": user["_id"]}, {"$set": {"history": history}}))
+    if update_batch:
+        user_coll.bulk_write(update_batch)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,5 @@
 from queue import Full, Queue
+from collections import namedtuple
 from contextlib import closing
 import logging
 import multiprocessing
@@ -26,6 +27,11 @@ BATCH_SUBMISSION_REGEX = re.compile(r"(.+)b\d$")
 PUNC_REGEX = re.compile(r"[.?!,;:\"\-]")
 WHITESPACE_REGEX = re.compile(r"\s+")
 
+# The outcome of pre-screening one submission. "err" is None unless the "case" is "err".
+PrescreenResult = namedtuple("PrescreenResult", ["name", "case", "err"])
+# An unhandled exception that stopped the pre-screening of the named submissions.
+PrescreenFailure = namedtuple("PrescreenFailure", ["names", "exc"])
+
 
 class QuizzrWatcher:
     """A class for polling a queue directory and running a function when submissions are found. A submission must
@@ -82,7 +88,7 @@ class QuizzrWatcher:
                                 # FIXME: Will raise FileExistsError on Windows
                                 os.rename(sub_path, error_path)
                     try:
-                        self.queue.put((queued_submissions, e))
+                        self.queue.put(PrescreenFailure(queued_submissions, e))
                     except Full:
                         self.logger.error("Could not push error to queue")
                 else:
@@ -150,8 +156,8 @@ class QuizzrProcessorHead:
         Precondition: WAV and JSON files exist in ``<self.directory>/queue`` for each submission name provided.
 
         :param submissions: A list of submission names to pre-screen
-        :return: A list of dictionaries containing the submission "name", the "case", and the "err" when the "case" is
-                 "err"
+        :return: A list of PrescreenResult tuples containing the submission "name", the "case", and the "err" when the
+                 "case" is "err"
         """
         results = self.qp.pick_submissions(submissions)
 
@@ -201,10 +207,8 @@ class QuizzrProcessorHead:
         summary = []
 
         for submission in results:
-            end_result = {"name": submission, "case": results[submission]["case"]}
-            if end_result["case"] == "err":
-                end_result["err"] = results[submission]["err"]
-            summary.append(end_result)
+            case = results[submission]["case"]
+            summary.append(PrescreenResult(submission, case, results[submission]["err"] if case == "err" else None))
             self.logger.info(f"Removing submission with name '{submission}'")
             delete_submission(self.rec_directory, submission, self.submission_file_types)
 
@@ -301,7 +305,8 @@ class QuizzrProcessor:
                         }
                         final_results[submission]["metadata"]["duration"] = self.get_duration(submission)
                         num_accepted_submissions += 1
-            self.logger.debug(f"final_results = {pprint.pformat(final_results)}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"final_results = {pprint.pformat(final_results)}")
 
             # FIXME: This number is currently inaccurate with batch submissions.
             self.logger.info(f"Accepted {num_accepted_submissions} of {len(typed_submissions['normal'])} submission(s)")
@@ -1,4 +1,7 @@
 import argparse
+import atexit
+import hashlib
+import heapq
 import json
 import logging
 import logging.handlers
@@ -9,29 +12,31 @@ import queue
 import random
 import re
 import string
+import sys
+import threading
 import time
-from copy import deepcopy
-from itertools import chain
 from sys import exit
-from datetime import datetime, timedelta
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from itertools import chain, zip_longest
 from http import HTTPStatus
 from secrets import token_urlsafe
 from typing import List, Union, Tuple, Dict, Any, Optional
 
 import google.api_core.exceptions
-import jsonschema.exceptions
 import pymongo.errors
 import werkzeug.datastructures
 from firebase_admin import auth
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
-from fuzzywuzzy import fuzz
 
-import bson.json_util
-from flask import Flask, request, render_template, send_file, make_response
+from flask import Flask, Response, request, render_template
 from flask_cors import CORS
-from openapi_schema_validator import validate
-from pymongo import UpdateOne
+from openapi_schema_validator import OAS30Validator
+from pymongo import ReturnDocument, UpdateOne
+from rapidfuzz import fuzz, utils
 from werkzeug.exceptions import abort
 
 import rec_processing
@@ -45,6 +50,85 @@ logging.basicConfig(level=os.environ.get("QUIZZR_LOG") or "INFO")
 DEV_ENV_NAME = "development"
 PROD_ENV_NAME = "production"
 TEST_ENV_NAME = "testing"
+MAX_SAVE_WORKERS = 8  # Maximum number of threads used to write a batch of recordings to disk
+INDEX_RANGE_SEPARATOR_REGEX = re.compile(r",\s*")
+VALID_REC_TYPES = frozenset(["normal", "buzz", "answer"])
+PRESCREEN_POLL_INTERVAL = 1.0  # Maximum number of seconds between sweeps of expired pre-screen statuses
+PRESCREEN_STATUS_LIFETIME_NS = 30 * 60 * 10 ** 9  # Nanoseconds that a pre-screen status pointer stays valid
+GAME_DATE_FORMAT = "%Y %m %d %H %M %S"
+
+# Fork the pre-screening process on Linux, so that it starts without re-importing the server and without pickling its
+# arguments, which include the Firebase app. Fork is already the default there; this keeps it if the default changes.
+# Forking is only safe while no thread of the server holds a lock, so create_app starts its own threads after the fork.
+# Other platforms keep their default start method.
+mp_context = multiprocessing.get_context("fork" if sys.platform.startswith("linux") else None)
+
+
+@lru_cache(maxsize=4096)
+def _normalize_answer(answer: str) -> str:
+    """
+    Normalize an answer for fuzzy matching. Results are cached because short answers are often repeated.
+
+    :param answer: The answer to normalize
+    :return: The answer in lowercase, with non-alphanumeric characters replaced by spaces and surrounding whitespace trimmed
+    """
+    return utils.default_process(answer)
+
+
+def _id_key(qid: int, sentence_id: Optional[int]) -> str:
+    """
+    Build the key that matches unprocessed audio documents to the question or sentence they were recorded for.
+
+    :param qid: The ID of the question
+    :param sentence_id: (optional) The ID of the sentence within the question
+    :return: The question ID, followed by the sentence ID if there is one
+    """
+    return f"{qid}_{sentence_id}" if sentence_id else str(qid)
+
+
+class PrescreenStatus:
+    """The pre-screening status of a submission, accessible through a short-lived pointer."""
+    __slots__ = ("pointer", "name", "expiry", "status", "err", "accepted")
+
+    def __init__(self, pointer: str, name: str, expiry: int):
+        """
+        :param pointer: The pointer to access the status with
+        :param name: The name of the submission
+        :param expiry: The value of ``time.monotonic_ns()`` at which the pointer stops being valid
+        """
+        self.pointer = pointer
+        self.name = name
+        self.expiry = expiry
+        self.status = "running"
+        self.err = None  # Only set when the status is "err"
+        self.accepted = None  # Only set when the status is "finished"
+
+    def __repr__(self):
+        return f"PrescreenStatus({self.to_dict()!r})"
+
+    def apply_result(self, result: "rec_processing.PrescreenResult"):
+        """
+        Update the status with the outcome of pre-screening the submission.
+
+        :param result: The result from the pre-screening process
+        """
+        if result.case == "err":
+            self.status = "err"
+            self.err = result.err
+        else:
+            self.status = "finished"
+            self.accepted = result.case == "accepted"
+
+    def to_dict(self) -> dict:
+        """
+        :return: The pointer, name, and status of the submission, along with the "err" or "accepted" field when set
+        """
+        result = {"pointer": self.pointer, "name": self.name, "status": self.status}
+        if self.err is not None:
+            result["err"] = self.err
+        if self.accepted is not None:
+            result["accepted"] = self.accepted
+        return result
 
 
 # TODO: Re-implement QuizzrWatcher through the Celery framework for Flask.
@@ -67,6 +151,10 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
         instance_relative_config=True,
         instance_path=instance_path
     )
+    # Match routes with or without a trailing slash instead of issuing a redirect.
+    app.url_map.strict_slashes = False
+    app.json_encoder = sv_util.ORJSONEncoder
+    app.json_decoder = sv_util.ORJSONDecoder
     storage_root = test_storage_root or os.environ.get("Q_STG_ROOT") or os.path.join(app.instance_path, "storage")
     log_dir = os.path.join(storage_root, "logs")
     if not os.path.exists(log_dir):
@@ -75,7 +163,12 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
     handler = logging.handlers.TimedRotatingFileHandler(log_path, when='h', interval=12, backupCount=13)
     formatter = logging.Formatter("[%(asctime)s] %(levelname)s - %(name)s: %(message)s")
     handler.setFormatter(formatter)
-    app.logger.addHandler(handler)
+    # Write to the log file from a background thread so that logging threads only enqueue their records. The queue is
+    # a multiprocessing queue because the pre-screening process inherits the handler and logs through it as well. The
+    # listener is started after the pre-screening process is forked; records logged until then wait in the queue.
+    log_queue = mp_context.Queue(-1)
+    log_listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+    app.logger.addHandler(logging.handlers.QueueHandler(log_queue))
     app.logger.info(f"Instantiated server with instance path '{instance_path}'")
     CORS(app)
     app.logger.info("Creating instance directory...")
@@ -122,7 +215,24 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
         "DEFAULT_LEADERBOARD_SIZE": 10,
         "MAX_USERNAME_LENGTH": 16,
         "USERNAME_CHAR_SET": string.ascii_letters + string.digits,
-        "DEFAULT_RATE_LIMITS": []
+        "DEFAULT_RATE_LIMITS": [],
+        "MONGO_CLIENT_OPTIONS": {
+            "maxPoolSize": 200,
+            "minPoolSize": 10,
+            "maxIdleTimeMS": 300000,
+            "waitQueueTimeoutMS": 2000,
+            "retryWrites": True
+        },
+        "MAX_GAME_HISTORY_SIZE": 100,
+        "AUDIO_CACHE_MAX_AGE": 604800,
+        "CACHE_CONFIGS": {
+            "questions": {"maxSize": 4096, "ttl": 300},
+            "games": {"maxSize": 1024, "ttl": 86400},
+            "leaderboards": {"maxSize": 256, "ttl": 30},
+            "difficultyBounds": {"maxSize": 2, "ttl": 600},
+            "idTokens": {"maxSize": 4096, "ttl": 300},
+            "profiles": {"maxSize": 1024, "ttl": 60}
+        }
     }
 
     config_dir = os.path.join(app.instance_path, "config")
@@ -171,6 +281,9 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
 
     app_conf["REC_DIR"] = rec_dir
     api = QuizzrAPISpec(os.path.join(server_dir, "reference", "backend.yaml"))
+    modify_profile_schema = api.request_body_schema("modify_profile")
+    OAS30Validator.check_schema(modify_profile_schema)
+    modify_profile_validator = OAS30Validator(modify_profile_schema)
 
     app.config.from_mapping(app_conf)
 
@@ -184,6 +297,14 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
             app.logger.critical("Configured DIFFICULTY_DIST percentages must be between 0 and 1.")
             exit(1)
 
+    # An empty character class is not a valid pattern, so match only the empty string when no characters are allowed.
+    username_char_set = app.config["USERNAME_CHAR_SET"]
+    username_pattern = re.compile(f"[{re.escape(username_char_set)}]*" if username_char_set else "")
+    log_private_data = app.config["LOG_PRIVATE_DATA"]
+    min_answer_similarity = app.config["MIN_ANSWER_SIMILARITY"]
+    # Flask takes a lock on every access to app.logger, so the helpers that run on every request use this binding.
+    logger = app.logger
+
     app.logger.info("Finished configuring server instance")
 
     app.logger.info("Initializing third-party services...")
@@ -192,11 +313,25 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
     app.logger.info(f"Environment set to '{app_conf['Q_ENV']}'")
     qtpm = QuizzrTPM(app_conf["DATABASE"], app_conf, os.path.join(secret_dir, "firebase_storage_key.json"),
                      app.logger.getChild("qtpm"))
+    qtpm.create_indexes()
     app.logger.info("Initialized third-party services")
 
+    cache_configs = app.config["CACHE_CONFIGS"]
+    question_cache = sv_util.ExpiringCache(cache_configs["questions"]["maxSize"], cache_configs["questions"]["ttl"])
+    game_cache = sv_util.ExpiringCache(cache_configs["games"]["maxSize"], cache_configs["games"]["ttl"])
+    leaderboard_cache = sv_util.ExpiringCache(
+        cache_configs["leaderboards"]["maxSize"], cache_configs["leaderboards"]["ttl"]
+    )
+    difficulty_bounds_cache = sv_util.ExpiringCache(
+        cache_configs["difficultyBounds"]["maxSize"], cache_configs["difficultyBounds"]["ttl"]
+    )
+    # Entries are also checked against the expiration time of the token itself before use.
+    id_token_cache = sv_util.ExpiringCache(cache_configs["idTokens"]["maxSize"], cache_configs["idTokens"]["ttl"])
+    profile_cache = sv_util.ExpiringCache(cache_configs["profiles"]["maxSize"], cache_configs["profiles"]["ttl"])
+
     app.logger.debug("Instantiating process...")
-    prescreen_results_queue = multiprocessing.Queue()
-    qw_process = multiprocessing.Process(target=rec_processing.start_watcher, kwargs={
+    prescreen_results_queue = mp_context.Queue()
+    qw_process = mp_context.Process(target=rec_processing.start_watcher, kwargs={
         "db_name": app_conf["DATABASE"],
         "tpm_config": app_conf,
         "firebase_app_specifier": qtpm.app,
@@ -214,6 +349,10 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
 
     app_attributes["qwStartTime"] = time.time()
     qw_process.start()
+    # A thread running at the time of the fork could hold the lock of the log handler and leave it locked forever in
+    # the child, so only start the listener afterwards.
+    log_listener.start()
+    atexit.register(log_listener.stop)
     app_attributes["qwPid"] = qw_process.pid
     app.logger.debug(f"qwPid = {app_attributes['qwPid']}")
     app.logger.info("Started pre-screening program")
@@ -227,7 +366,12 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
         app.logger.info("No default rate limits defined. Skipping rate limiter initialization")
 
     secret_keys = {}
-    prescreen_statuses = []
+    prescreen_statuses = {}  # PrescreenStatus objects keyed by pointer
+    prescreen_statuses_by_name = {}  # The same objects keyed by submission name
+    prescreen_expiry_heap = []  # Min-heap of (expiry, pointer) tuples, one for each pre-screen status document
+    unclaimed_prescreen_results = {}  # Results of submissions that have no pointer yet, keyed by submission name
+    unclaimed_prescreen_expiries = deque()  # (expiry, name) tuples for the unclaimed results, oldest first
+    prescreen_lock = threading.Lock()  # Guards all of the pre-screen status structures above
     pprinter = pprint.PrettyPrinter()
 
     app.logger.info("Completed initialization")
@@ -269,13 +413,12 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
             _debug_variable("transcripts", transcripts)
             _debug_variable("correct_flags", correct_flags)
 
-            if not (len(recordings) == len(rec_types)
-                    and (not qb_ids or len(recordings) == len(qb_ids))
-                    and (not sentence_ids or len(recordings) == len(sentence_ids))
-                    and (not diarization_metadata_list or len(recordings) == len(diarization_metadata_list))
-                    and (not expected_answers or len(recordings) == len(expected_answers))
-                    and (not transcripts or len(recordings) == len(transcripts))
-                    and (not correct_flags or len(recordings) == len(correct_flags))):
+            # Every optional argument must either be left out or have a value for each recording.
+            num_recordings = len(recordings)
+            optional_lists = [qb_ids, sentence_ids, diarization_metadata_list, expected_answers, transcripts,
+                              correct_flags]
+            if len(rec_types) != num_recordings or any(
+                    values and len(values) != num_recordings for values in optional_lists):
                 return _make_err_response(
                     "Received incomplete form batch",
                     "incomplete_batch",
@@ -301,8 +444,11 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
         results_projection = ["_id", "diarMetadata"]  # In addition to the transcript
 
         app.logger.info(f"Finding a batch ({max_docs} max) of unprocessed audio documents...")
-        audio_cursor = qtpm.unproc_audio.find(limit=max_docs)
-        id2entries = {}
+        audio_cursor = qtpm.unproc_audio.find(
+            projection={field: 1 for field in [*results_projection, "qb_id", "sentenceId", "tokenizationId"]},
+            limit=max_docs
+        )
+        id2entries = defaultdict(list)
         qids = []
         audio_doc_count = 0
         for audio_doc in audio_cursor:
@@ -314,13 +460,8 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
                 app.logger.warning("Audio document does not contain question ID")
                 errs.append(("internal_error", "undefined_qb_id"))
                 continue
-            id_key = "_".join([str(qid), str(sentence_id)]) if sentence_id else str(qid)
-            if id_key not in id2entries:
-                id2entries[id_key] = []
-            entry = {}
-            for field in results_projection:
-                if field in audio_doc:
-                    entry[field] = audio_doc[field]
+            id_key = _id_key(qid, sentence_id)
+            entry = {field: audio_doc[field] for field in results_projection if field in audio_doc}
             if "tokenizationId" in audio_doc:
                 entry["tokenizationId"] = audio_doc["tokenizationId"]
             id2entries[id_key].append(entry)
@@ -335,7 +476,6 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
                 HTTPStatus.NOT_FOUND
             )
 
-        _debug_variable("id2entries", id2entries)
         app.logger.info(f"Found {audio_doc_count} unprocessed audio document(s)")
         if not qids:
             app.logger.error("No audio documents contain question IDs")
@@ -345,15 +485,17 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
                 HTTPStatus.NOT_FOUND
             )
 
-        question_gen = qtpm.find_questions(qids)
+        question_gen = qtpm.find_questions(
+            qids, projection={"_id": 0, "qb_id": 1, "sentenceId": 1, "transcript": 1, "tokenizations": 1}
+        )
         for question in question_gen:
             _debug_variable("question", question)
             qid = question["qb_id"]
             sentence_id = question.get("sentenceId")
-            id_key = "_".join([str(qid), str(sentence_id)]) if sentence_id else str(qid)
+            id_key = _id_key(qid, sentence_id)
             orig_transcript = question.get("transcript")
             if orig_transcript:
-                entries = id2entries[id_key]
+                entries = id2entries.get(id_key, [])
                 for entry in entries:
                     if "tokenizations" in question and "tokenizationId" in entry:
                         slice_start, slice_end = question["tokenizations"][entry.pop("tokenizationId")]
@@ -364,10 +506,8 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
 
         _debug_variable("id2entries", id2entries)
 
-        results = []
-        for entries in id2entries.values():
-            results += entries
-        app.logger.debug(f"Final Results: {results!r}")
+        results = list(chain.from_iterable(id2entries.values()))
+        app.logger.debug("Final Results: %r", results)
         response = {"results": results}
         if errs:
             response["errors"] = [{"type": err[0], "reason": err[1]} for err in errs]
@@ -399,20 +539,15 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
         :return: A dictionary with the key "prescreenPointers" and a status code. If an error occurred, a string with a
                  status code is returned instead.
         """
-        valid_rec_types = ["normal", "buzz", "answer"]
-
         pointers = []
         submissions = []
 
-        for i in range(len(recordings)):
-            recording = recordings[i]
-            rec_type = rec_types[i]
-            qb_id = qb_ids[i] if len(qb_ids) > i else None
-            sentence_id = sentence_ids[i] if len(sentence_ids) > i else None
-            diarization_metadata = diarization_metadata_list[i] if len(diarization_metadata_list) > i else None
-            expected_answer = expected_answers[i] if len(expected_answers) > i else None
-            transcript = transcripts[i] if len(transcripts) > i else None
-            correct = correct_flags[i] if len(correct_flags) > i else None
+        # Optional arguments that were left out are filled in with None.
+        arguments = zip_longest(recordings, rec_types, qb_ids or [], sentence_ids or [],
+                                diarization_metadata_list or [], expected_answers or [], transcripts or [],
+                                correct_flags or [])
+        for i, (recording, rec_type, qb_id, sentence_id, diarization_metadata, expected_answer, transcript,
+                correct) in enumerate(arguments):
 
             _debug_variable("qb_id", qb_id)
             _debug_variable("sentence_id", sentence_id)
@@ -439,7 +574,7 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
                     ["recType"],
                     True
                 )
-            elif rec_type not in valid_rec_types:
+            elif rec_type not in VALID_REC_TYPES:
                 return _make_err_response(
                     f"Invalid rec type: '{rec_type!r}'",
                     "invalid_arg",
@@ -484,15 +619,23 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
 
         if len(submissions) == 1:
             submission_names = [_save_recording(queue_dir, *submissions[0])]
-        else:
+        elif len(submissions) > 1:
             submission_names = _save_recording_batch(queue_dir, submissions)
+        else:
+            submission_names = []
 
         for submission_name in submission_names:
             _debug_variable("submission_name", submission_name)
             pointer = token_urlsafe(64)
-            expiry = datetime.now() + timedelta(minutes=30)
-            ps_doc = {"pointer": pointer, "name": submission_name, "status": "running", "expiry": expiry}
-            prescreen_statuses.append(ps_doc)
+            expiry = time.monotonic_ns() + PRESCREEN_STATUS_LIFETIME_NS
+            ps_doc = PrescreenStatus(pointer, submission_name, expiry)
+            with prescreen_lock:
+                prescreen_statuses[pointer] = ps_doc
+                prescreen_statuses_by_name[submission_name] = ps_doc
+                heapq.heappush(prescreen_expiry_heap, (expiry, pointer))
+                unclaimed_result = unclaimed_prescreen_results.pop(submission_name, None)
+                if unclaimed_result is not None:
+                    ps_doc.apply_result(unclaimed_result)
             pointers.append(pointer)
 
         return {"prescreenPointers": pointers}, HTTPStatus.ACCEPTED
@@ -624,7 +767,7 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
                 True
             )
 
-        question = qtpm.rec_questions.find_one({"qb_id": int(qid)})
+        question = _get_question_answer(int(qid))
         if not question:
             return _make_err_response(
                 "Could not find question",
@@ -640,16 +783,31 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
                 HTTPStatus.NOT_FOUND,
                 log_msg=True
             )
-
-        answer_similarity = fuzz.token_set_ratio(user_answer, correct_answer)
+        # Questions uploaded before answers were normalized on insert do not have this field.
+        normalized_answer = question.get("normalizedAnswer")
+        if normalized_answer is None:
+            normalized_answer = _normalize_answer(correct_answer)
+
+        normalized_user_answer = _normalize_answer(user_answer)
+        if not normalized_user_answer or not normalized_answer:
+            return {"correct": False}
+        if normalized_user_answer == normalized_answer:
+            return {"correct": True}
+
+        min_similarity = min_answer_similarity
+        # Round to keep the integer scores that the similarity threshold was tuned for. Any score below the cutoff
+        # would round to less than the threshold, so RapidFuzz can stop early and return 0 for it.
+        answer_similarity = round(fuzz.token_set_ratio(
+            normalized_user_answer, normalized_answer, processor=None, score_cutoff=min_similarity - 0.5
+        ))
         _debug_variable("answer_similarity", answer_similarity)
-        return {"correct": answer_similarity >= app.config["MIN_ANSWER_SIMILARITY"]}
+        return {"correct": answer_similarity >= min_similarity}
 
     @app.route("/answer_full/<int:qid>", methods=["GET"])
     def get_answer(qid):
         """Get the answer of a question. This is intended for use by a backend component."""
 
-        question = qtpm.rec_questions.find_one({"qb_id": qid})
+        question = _get_question_answer(qid)
         if not question:
             return _make_err_response(
                 "Could not find question",
@@ -668,6 +826,18 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
 
         return {"answer": correct_answer}
 
+    def _get_question_answer(qid: int) -> Optional[dict]:
+        """
+        Get the answer fields of a recorded question, using the question cache when possible.
+
+        :param qid: The qb_id of the question
+        :return: The "answer" and "normalizedAnswer" fields of the question, or None if the question does not exist
+        """
+        return question_cache.get_or_load(
+            qid,
+            lambda: qtpm.rec_questions.find_one({"qb_id": qid}, {"_id": 0, "answer": 1, "normalizedAnswer": 1})
+        )
+
     @app.get("/audio/<path:blob_path>")
     def retrieve_audio_file(blob_path):
         """
@@ -676,8 +846,23 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
         :param blob_path: The path to a Firebase Cloud Storage object
         :return: A response containing the bytes of the audio file
         """
+        # The contents of a blob path never change, so clients can revalidate with an ETag derived from the path
+        # alone, without fetching the blob.
+        etag = hashlib.blake2b(blob_path.encode(), digest_size=16).hexdigest()
+        cache_control = f"public, max-age={app.config['AUDIO_CACHE_MAX_AGE']}, immutable"
+
+        def not_modified():
+            not_modified_response = Response(status=HTTPStatus.NOT_MODIFIED, headers={"Cache-Control": cache_control})
+            not_modified_response.set_etag(etag)
+            return not_modified_response
+
+        # "If-None-Match: *" only matches if the file exists, so it cannot skip the lookup.
+        if_none_match = request.if_none_match
+        if not if_none_match.star_tag and if_none_match.contains(etag):
+            return not_modified()
+
         try:
-            file = qtpm.get_file_blob(blob_path)
+            blob = qtpm.find_file_blob(blob_path)
         except google.api_core.exceptions.NotFound:
             return _make_err_response(
                 "Audio not found",
@@ -686,7 +871,44 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
                 [blob_path],
                 log_msg=True
             )
-        return send_file(file, mimetype="audio/wav")
+        if if_none_match.star_tag:
+            return not_modified()
+        size = blob.size
+        headers = {"Cache-Control": cache_control, "Accept-Ranges": "bytes"}
+
+        # Browsers request ranges to seek within audio, and Safari will not play audio without them. A range is only
+        # honored if an If-Range header, when present, still matches the file. Multiple ranges would need a multipart
+        # response, so requests for them get the whole file instead.
+        byte_ranges = request.range
+        if (byte_ranges and byte_ranges.units == "bytes" and len(byte_ranges.ranges) == 1
+                and request.if_range.etag in (None, etag)):
+            byte_range = byte_ranges.range_for_length(size)
+            if byte_range is None:
+                response, status_code = _make_err_response(
+                    "Requested range not satisfiable",
+                    "bad_range",
+                    HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE,
+                    [request.headers.get("Range")],
+                    log_msg=True
+                )
+                return response, status_code, {"Content-Range": f"bytes */{size}", "Accept-Ranges": "bytes"}
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+            status_code = HTTPStatus.PARTIAL_CONTENT
+        else:
+            start, end = 0, size
+            status_code = HTTPStatus.OK
+
+        headers["Content-Length"] = str(end - start)
+        response = Response(
+            qtpm.stream_file_blob(blob, start, end),
+            status=status_code,
+            mimetype="audio/wav",
+            headers=headers,
+            direct_passthrough=True
+        )
+        response.set_etag(etag)
+        return response
 
     @app.delete("/audio/<audio_id>")
     def delete_audio(audio_id):
@@ -699,9 +921,10 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
         """
 
         # TODO: MAKE THIS OPERATION SECURE! REQUIRE AUTHENTICATION FROM THE USER WHO IS DELETING THE RECORDING!
-        audio_doc = qtpm.audio.find_one({"_id": audio_id})
+        audio_projection = {"recType": 1, "userId": 1, "qb_id": 1, "batchUUID": 1}
+        audio_doc = qtpm.audio.find_one({"_id": audio_id}, audio_projection)
         if _query_flag("batch") and "batchUUID" in audio_doc:
-            cursor = qtpm.audio.find({"batchUUID": audio_doc["batchUUID"]})
+            cursor = qtpm.audio.find({"batchUUID": audio_doc["batchUUID"]}, audio_projection)
             for doc in cursor:
                 try:
                     _delete_audio(doc)
@@ -752,7 +975,6 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
     def downvote(audio_id):
         """Downvote an audio recording."""
         args = request.get_json()
-        uid = args["userId"]
         if "userId" not in args:
             return _make_err_response(
                 "Argument 'userId' is undefined",
@@ -760,24 +982,24 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
                 HTTPStatus.BAD_REQUEST,
                 log_msg=True
             )
+        uid = args["userId"]
 
-        user = qtpm.users.find_one({"_id": uid})
-        rec_votes = user.get("recVotes") or []
-        has_voted = False
-        for i, rec_vote in enumerate(rec_votes):
-            if rec_vote["id"] == audio_id:
-                has_voted = True
-                if rec_vote["vote"] == -1:  # Avoid downvoting twice.
-                    return '', HTTPStatus.OK
-                else:
-                    qtpm.users.update_one({"_id": uid}, {"$set": {f"recVotes.{i}.vote": -1}})
-                    qtpm.audio.update_one({"_id": audio_id}, {"$inc": {"upvotes": -1}})
-                    break
-
-        if not has_voted:
-            qtpm.users.update_one({"_id": uid}, {"$push": {"recVotes": {"id": audio_id, "vote": -1}}})
+        prev_vote = _set_rec_vote(uid, audio_id, -1)
+        if prev_vote is None:
+            return _make_err_response(
+                f"No such user: {uid}",
+                "user_not_found",
+                HTTPStatus.NOT_FOUND,
+                [uid],
+                True
+            )
+        if prev_vote == -1:  # Avoid downvoting twice.
+            return '', HTTPStatus.OK
 
-        result = qtpm.audio.update_one({"_id": audio_id}, {"$inc": {"downvotes": 1}})
+        vote_increments = {"downvotes": 1}
+        if prev_vote == 1:
+            vote_increments["upvotes"] = -1
+        result = qtpm.audio.update_one({"_id": audio_id}, {"$inc": vote_increments})
 
         if result.matched_count == 0:
             return _make_err_response(
@@ -789,6 +1011,41 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
             )
         return '', HTTPStatus.OK
 
+    def _set_rec_vote(user_id: str, audio_id: str, vote: int) -> Optional[int]:
+        """
+        Set the vote of a user on a recording in a single atomic update, adding the vote to "recVotes" if the user has
+        not voted on the recording yet.
+
+        :param user_id: The ID of the user who is voting
+        :param audio_id: The ID of the recording being voted on
+        :param vote: 1 for an upvote or -1 for a downvote
+        :return: The previous vote of the user on the recording (0 if there was none), or None if the user does not exist
+        """
+        rec_votes = {"$ifNull": ["$recVotes", []]}
+        new_rec_votes = {"$cond": [
+            {"$in": [{"$literal": audio_id}, {"$ifNull": ["$recVotes.id", []]}]},
+            {"$map": {
+                "input": rec_votes,
+                "as": "recVote",
+                "in": {"$cond": [
+                    {"$eq": ["$$recVote.id", {"$literal": audio_id}]},
+                    {"$mergeObjects": ["$$recVote", {"vote": vote}]},
+                    "$$recVote"
+                ]}
+            }},
+            {"$concatArrays": [rec_votes, [{"id": {"$literal": audio_id}, "vote": vote}]]}
+        ]}
+        user = qtpm.users.find_one_and_update(
+            {"_id": user_id},
+            [{"$set": {"recVotes": new_rec_votes}}],
+            projection={"recVotes": {"$elemMatch": {"id": audio_id}}},
+            return_document=ReturnDocument.BEFORE
+        )
+        if user is None:
+            return None
+        prev_rec_votes = user.get("recVotes")
+        return prev_rec_votes[0]["vote"] if prev_rec_votes else 0
+
     @app.put("/game_results")
     def handle_game_results():
         """
@@ -823,7 +1080,8 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
                 True
             )
 
-        session = qtpm.games.find_one({"_id": game_id})
+        # Game sessions are never modified after being uploaded, so they can be cached without invalidation.
+        session = game_cache.get_or_load(game_id, lambda: qtpm.games.find_one({"_id": game_id}))
         if session is None:
             return _make_err_response(
                 f"Game session with ID '{game_id}' not found",
@@ -887,6 +1145,14 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
                 True
             )
 
+        # Game histories are sorted by their dates as strings, which is only chronological if every part of the date
+        # is zero-padded. strptime also accepts unpadded dates, so store them in a canonical form. Dates that cannot be
+        # parsed are stored as they are, as before; maintenance/normalize_game_dates.py reports them.
+        try:
+            session["date"] = datetime.strptime(session["date"], GAME_DATE_FORMAT).strftime(GAME_DATE_FORMAT)
+        except (KeyError, TypeError, ValueError):
+            app.logger.warning(f"Could not normalize the date of game session {game_id!r}")
+
         session["_id"] = game_id
 
         try:
@@ -899,6 +1165,7 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
                 [game_id],
                 True
             )
+        game_cache.set(game_id, session)
 
         update_game_histories(session)
 
@@ -909,17 +1176,25 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
         Update the "history" field of every player in the "settings" of the given session
 
         :param session: The metadata of a game session. Requires a "settings" field that contains the "players" field,
-                        an array of user IDs.
+                        an array of user IDs. The "date" field should be in the zero-padded form that post_game stores.
         """
         update_batch = []
+        # Keep the history sorted by date so that the slice below always drops the oldest sessions. The dates are
+        # compared as strings, which is only chronological because they are zero-padded. Histories written before
+        # post_game normalized dates must be fixed with maintenance/normalize_game_dates.py, or the slice may drop
+        # newer sessions.
+        history_push = {"$each": [session], "$sort": {"date": pymongo.ASCENDING}}
+        max_history_size = app.config["MAX_GAME_HISTORY_SIZE"]
+        if max_history_size is not None:
+            history_push["$slice"] = -max_history_size
 
         for player in session["settings"]["players"]:
-            update_batch.append(UpdateOne({"_id": player}, {"$push": {"history": session}}))
+            update_batch.append(UpdateOne({"_id": player}, {"$push": {"history": history_push}}))
         
         if len(update_batch) == 0:
             return
 
-        qtpm.users.bulk_write(update_batch)
+        qtpm.users.bulk_write(update_batch, ordered=False)
 
     def handle_game_results_category(session_results):
         """
@@ -933,169 +1208,50 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
         category = session_results["category"]
         user_results = session_results["users"]
         update_batch = []
-        app.logger.info(f"Processing updates for {len(session_results['users'])} users...")
-        for username, update_args in user_results.items():
-            app.logger.info(f"Finding user profile with username '{username}'...")
-            user_doc = qtpm.users.find_one({"username": username})
-            if "stats" not in user_doc:
-                app.logger.debug("Creating stub for field 'stats'...")
-                user_doc["stats"] = {}
-
-            if mode not in user_doc["stats"]:
-                app.logger.debug(f"Creating stub for mode '{mode}'...")
-                user_doc["stats"][mode] = {
-                    "questions": {
-                        "played": {"all": 0},
-                        "buzzed": {"all": 0},
-                        "correct": {"all": 0},
-                        "cumulativeProgressOnBuzz": {},
-                        "avgProgressOnBuzz": {}
-                    },
-                    "game": {
-                        "played": {"all": 0},
-                        "won": {"all": 0}
-                    }
-                }
-
-            _debug_variable(f"user.stats.{mode}", user_doc["stats"][mode])
-
-            old_question_stats = user_doc["stats"][mode]["questions"]
-
-            for field in ["played", "buzzed", "correct"]:
-                if category not in old_question_stats[field]:
-                    app.logger.debug(f"Set default value for field '{field}', category '{category}'")
-                    old_question_stats[field][category] = 0
 
-            old_game_stats = user_doc["stats"][mode]["game"]
-
-            for field in ["played", "won"]:
-                if category not in old_game_stats[field]:
-                    app.logger.debug(f"Set default value for field '{field}', category '{category}'")
-                    old_game_stats[field][category] = 0
+        # The field paths only depend on the mode and category, so build them once for all users.
+        stats_index = f"stats.{mode}"
+        q_index = f"{stats_index}.questions"
+        g_index = f"{stats_index}.game"
+        game_categories = ["all", category]
+        q_paths = {field: [f"{q_index}.{field}.{cat}" for cat in game_categories]
+                   for field in ["played", "buzzed", "correct"]}
+        g_paths = {field: [f"{g_index}.{field}.{cat}" for cat in game_categories]
+                   for field in ["played", "finished", "won"]}
+        c_progress_index = f"{q_index}.cumulativeProgressOnBuzz"
 
+        app.logger.info(f"Processing updates for {len(session_results['users'])} users...")
+        for username, update_args in user_results.items():
             question_stats = update_args["questionStats"]
-
-            app.logger.info("Retrieving projected results...")
-
-            played_all = old_question_stats["played"]["all"] + question_stats["played"]
-            played_categorical = old_question_stats["played"][category] + question_stats["played"]
-            buzzed_all = old_question_stats["buzzed"]["all"] + question_stats["buzzed"]
-            buzzed_categorical = old_question_stats["buzzed"][category] + question_stats["buzzed"]
-
-            _debug_variable("total_questions_played", played_all)
-            _debug_variable("total_buzzes", buzzed_all)
-            _debug_variable("categorical_questions_played", played_categorical)
-            _debug_variable("categorical_buzzes", buzzed_categorical)
-
-            app.logger.info("Projected results retrieved")
-
-            old_c_progress_on_buzz = old_question_stats["cumulativeProgressOnBuzz"]
             c_progress_on_buzz = question_stats["cumulativeProgressOnBuzz"]
-
-            old_avg_progress_on_buzz = old_question_stats["avgProgressOnBuzz"]
-
-            _debug_variable("old_avg_progress_on_buzz", old_avg_progress_on_buzz)
-            app.logger.info("Calculating derived statistics...")
-
-            avg_progress_on_buzz_update = {}
-            for k in c_progress_on_buzz.keys():
-                if k not in old_c_progress_on_buzz:
-                    old_c_progress_on_buzz[k] = {"all": 0}
-
-                if category not in old_c_progress_on_buzz[k]:
-                    old_c_progress_on_buzz[k][category] = 0
-
-                avg_progress_on_buzz_update[k] = {
-                    "all": (old_c_progress_on_buzz[k]["all"] + c_progress_on_buzz[k]) / played_all,
-                    category: (old_c_progress_on_buzz[k][category] + c_progress_on_buzz[k]) / played_categorical
-                }
-
-            avg_progress_on_buzz = deepcopy(old_avg_progress_on_buzz)
-            sv_util.deep_update(avg_progress_on_buzz, avg_progress_on_buzz_update)
-
-            _debug_variable("avg_progress_on_buzz", avg_progress_on_buzz)
-
-            buzz_rate = {
-                "all": buzzed_all / played_all,
-                category: buzzed_categorical / played_categorical
-            }
-
-            _debug_variable("buzz_rate.all", buzz_rate["all"])
-            _debug_variable(f"buzz_rate.{category}", buzz_rate[category])
-
-            buzz_accuracy = {}
-            if buzzed_all == 0:
-                app.logger.debug("Number of total buzz-ins is 0. Skipping accuracy calculation")
-                buzz_accuracy["all"] = None
-            else:
-                buzz_accuracy["all"] = (old_question_stats["correct"]["all"] + question_stats["correct"]) / buzzed_all
-                _debug_variable("buzz_accuracy.all", buzz_accuracy["all"])
-            if buzzed_categorical == 0:
-                app.logger.debug("Number of categorical buzz-ins is 0. Skipping accuracy calculation")
-                buzz_accuracy[category] = None
-            else:
-                buzz_accuracy[category] = (old_question_stats["correct"][category] + question_stats["correct"]) \
-                                          / buzzed_categorical
-                _debug_variable(f"buzz_accuracy.{category}", buzz_accuracy[category])
-
-            win_rate = {
-                "all": (old_game_stats["won"]["all"] + int(update_args["won"]))
-                / (old_game_stats["played"]["all"] + 1),
-                category: (old_game_stats["won"][category] + int(update_args["won"]))
-                / (old_game_stats["played"][category] + 1)
-            }
-
-            _debug_variable(f"win_rate.all", win_rate["all"])
-            _debug_variable(f"win_rate.{category}", win_rate[category])
-
-            app.logger.info("Calculated derived statistics")
-
-            stats_index = f"stats.{mode}"
-            q_index = f"{stats_index}.questions"
-            g_index = f"{stats_index}.game"
-
-            processed_update_args = {
-                "$inc": {
-                    f"{q_index}.played.all": question_stats["played"],
-                    f"{q_index}.buzzed.all": question_stats["buzzed"],
-                    f"{q_index}.correct.all": question_stats["correct"],
-                    f"{q_index}.cumulativeProgressOnBuzz.percentQuestionRead.all": c_progress_on_buzz[
-                        "percentQuestionRead"],
-                    f"{q_index}.cumulativeProgressOnBuzz.numSentences.all": c_progress_on_buzz["numSentences"],
-
-                    f"{g_index}.played.all": 1,
-                    f"{g_index}.finished.all": int(update_args["finished"]),
-                    f"{g_index}.won.all": int(update_args["won"]),
-
-                    f"{q_index}.played.{category}": question_stats["played"],
-                    f"{q_index}.buzzed.{category}": question_stats["buzzed"],
-                    f"{q_index}.correct.{category}": question_stats["correct"],
-                    f"{q_index}.cumulativeProgressOnBuzz.percentQuestionRead.{category}": c_progress_on_buzz[
-                        "percentQuestionRead"],
-                    f"{q_index}.cumulativeProgressOnBuzz.numSentences.{category}": c_progress_on_buzz["numSentences"],
-
-                    f"{g_index}.played.{category}": 1,
-                    f"{g_index}.finished.{category}": int(update_args["finished"]),
-                    f"{g_index}.won.{category}": int(update_args["won"])
-                },
-                "$set": {
-                    f"{q_index}.buzzRate.all": buzz_rate["all"],
-                    f"{q_index}.buzzRate.{category}": buzz_rate[category],
-
-                    f"{q_index}.buzzAccuracy.all": buzz_accuracy["all"],
-                    f"{q_index}.buzzAccuracy.{category}": buzz_accuracy[category],
-
-                    f"{q_index}.avgProgressOnBuzz": avg_progress_on_buzz,
-
-                    f"{g_index}.winRate.all": win_rate["all"],
-                    f"{g_index}.winRate.{category}": win_rate[category]
-                }
-            }
-            update_batch.append(UpdateOne({"username": username}, processed_update_args))
+            game_values = {"played": 1, "finished": int(update_args["finished"]), "won": int(update_args["won"])}
+
+            increments = {}
+            for field, paths in q_paths.items():
+                for path in paths:
+                    increments[path] = question_stats[field]
+            for field, value in c_progress_on_buzz.items():
+                for cat in game_categories:
+                    increments[f"{c_progress_index}.{field}.{cat}"] = value
+            for field, paths in g_paths.items():
+                for path in paths:
+                    increments[path] = game_values[field]
+
+            pipeline = [
+                _increment_stage(increments),
+                _derived_stats_stage(
+                    mode,
+                    game_categories,
+                    {field: game_categories for field in c_progress_on_buzz},
+                    game_categories
+                )
+            ]
+            _debug_variable(f"pipeline.{username}", pipeline)
+            update_batch.append(UpdateOne({"username": username}, pipeline))
 
         if update_batch:
             app.logger.info("Sending bulk write operation...")
-            results = qtpm.users.bulk_write(update_batch)
+            results = qtpm.users.bulk_write(update_batch, ordered=False)
             app.logger.info(f"Matched {results.matched_count} documents and modified {results.modified_count} documents")
             app.logger.info(f"Request body contained profile updates for {len(session_results['users'])} users")
             return {"successful": results.matched_count, "requested": len(session_results["users"])}
@@ -1116,181 +1272,53 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
         user_results = session_results["users"]
         update_batch = []
 
-        for username, update_args in user_results.items():
-            app.logger.info(f"Finding user profile with username '{username}'...")
-            user_doc = qtpm.users.find_one({"username": username})
-
-            if "stats" not in user_doc:
-                app.logger.debug("Creating stub for field 'stats'...")
-                user_doc["stats"] = {}
-
-            if mode not in user_doc["stats"]:
-                app.logger.debug(f"Creating stub for mode '{mode}'...")
-                user_doc["stats"][mode] = {
-                    "questions": {
-                        "played": {"all": 0},
-                        "buzzed": {"all": 0},
-                        "correct": {"all": 0},
-                        "cumulativeProgressOnBuzz": {},
-                        "avgProgressOnBuzz": {}
-                    },
-                    "game": {
-                        "played": {"all": 0},
-                        "won": {"all": 0}
-                    }
-                }
-
-            _debug_variable(f"user.stats.{mode}", user_doc["stats"][mode])
-
-            old_question_stats = user_doc["stats"][mode]["questions"]
-            old_game_stats = user_doc["stats"][mode]["game"]
-            _debug_variable("old_question_stats", old_question_stats)
-            _debug_variable("old_game_stats", old_game_stats)
-
-            for field in ["played", "won"]:
-                for category in categories:
-                    if category not in old_game_stats[field]:
-                        app.logger.debug(f"Set default value for field '{field}', category '{category}' in game stats")
-                        old_game_stats[field][category] = 0
+        # The field paths only depend on the mode, so build their prefixes once for all users.
+        stats_index = f"stats.{mode}"
+        q_index = f"{stats_index}.questions"
+        g_index = f"{stats_index}.game"
+        game_categories = ["all", *categories]
 
+        for username, update_args in user_results.items():
             question_stats = update_args["questionStats"]
+            increments = {}
 
+            app.logger.info("Adding incrementation arguments for fields in question stats...")
             for field in ["played", "buzzed", "correct"]:
-                for category in question_stats[field]:
-                    if category not in old_question_stats[field]:
-                        app.logger.debug(f"Set default value for field '{field}', category '{category}', in question "
-                                         "stats")
-                        old_question_stats[field][category] = 0
-
-            stats_index = f"stats.{mode}"
-            q_index = f"{stats_index}.questions"
-            g_index = f"{stats_index}.game"
-
-            processed_update_args = {"$inc": {}, "$set": {}}
-            # Get totals for the played, buzzed, and correct fields while also adding $inc arguments.
-            totals = {}
-            for field in ["played", "buzzed", "correct"]:
-                app.logger.info(f"Adding incrementation arguments for field '{field}' in question stats...")
-                total_value = 0
-                for category, value in question_stats[field].items():
-                    _debug_variable("category", category)
-                    field_path = f"{q_index}.{field}.{category}"
-                    processed_update_args["$inc"][field_path] = value
-                    total_value += value
-                processed_update_args["$inc"][f"{q_index}.{field}.all"] = total_value
-                totals[field] = total_value
-                app.logger.info(f"Successfully added incrementation arguments for field '{field}' in question stats")
+                categorical_values = question_stats[field]
+                for category, value in categorical_values.items():
+                    increments[f"{q_index}.{field}.{category}"] = value
+                increments[f"{q_index}.{field}.all"] = sum(categorical_values.values())
 
-            app.logger.info("Adding incrementation arguments for fields in game stats...")
-            for category in categories:
-                _debug_variable("category", category)
-                processed_update_args["$inc"][f"{g_index}.played.{category}"] = 1
-                processed_update_args["$inc"][f"{g_index}.finished.{category}"] = int(update_args["finished"])
-                processed_update_args["$inc"][f"{g_index}.won.{category}"] = int(update_args["won"])
-
-            processed_update_args["$inc"][f"{g_index}.played.all"] = 1
-            processed_update_args["$inc"][f"{g_index}.finished.all"] = int(update_args["finished"])
-            processed_update_args["$inc"][f"{g_index}.won.all"] = int(update_args["won"])
-            app.logger.info("Successfully added incrementation arguments for fields in game stats")
-
-            # Add to cumulativeProgressOnBuzz fields and calculate avgProgressOnBuzz fields
-            app.logger.info("Calculating average stats on buzz timings...")
+            progress_categories = {}
             for field, categorical_values in question_stats["cumulativeProgressOnBuzz"].items():
-                _debug_variable(f"cumulativeProgressOnBuzz.{field}", categorical_values)
-                total_value = 0
-                if field not in old_question_stats["cumulativeProgressOnBuzz"]:
-                    old_question_stats["cumulativeProgressOnBuzz"][field] = {}
-
-                old_categorical_values = old_question_stats["cumulativeProgressOnBuzz"][field]
-                _debug_variable("old_categorical_values", old_categorical_values)
-
                 for category, value in categorical_values.items():
-                    if category not in old_categorical_values:
-                        old_categorical_values[category] = 0
-                    field_path = f"{q_index}.cumulativeProgressOnBuzz.{field}.{category}"
-                    processed_update_args["$inc"][field_path] = value
-                    avg_field_path = f"{q_index}.avgProgressOnBuzz.{field}.{category}"
-                    projected_value = value + old_categorical_values[category]
-                    projected_n_played = old_question_stats["played"][category] + question_stats["played"][category]
-                    if projected_n_played == 0:
-                        projected_average = None
-                    else:
-                        projected_average = projected_value / projected_n_played
-                    processed_update_args["$set"][avg_field_path] = projected_average
-                    total_value += value
-
-                if "all" not in old_categorical_values:
-                    old_categorical_values["all"] = 0
-                processed_update_args["$inc"][f"{q_index}.cumulativeProgressOnBuzz.{field}.all"] = total_value
-                total_projected_value = total_value + old_categorical_values["all"]
-                total_projected_n_played = old_question_stats["played"]["all"] + totals["played"]
-                if total_projected_n_played == 0:
-                    total_projected_average = None
-                else:
-                    total_projected_average = total_projected_value / total_projected_n_played
-                processed_update_args["$set"][f"{q_index}.avgProgressOnBuzz.{field}.all"] = total_projected_average
-            app.logger.info("Successfully calculated average stats on buzz timings")
-
-            # Calculate derived question statistics
-            app.logger.info("Calculating derived question statistics...")
-            for category in question_stats["played"]:
-                projected_played = old_question_stats["played"][category] + question_stats["played"][category]
-                projected_buzzed = old_question_stats["buzzed"][category] + question_stats["buzzed"][category]
-                projected_correct = old_question_stats["correct"][category] + question_stats["correct"][category]
-
-                if projected_played == 0:
-                    buzz_rate = None
-                else:
-                    buzz_rate = projected_buzzed / projected_played
-
-                if projected_buzzed == 0:
-                    buzz_accuracy = None
-                else:
-                    buzz_accuracy = projected_correct / projected_buzzed
-
-                processed_update_args["$set"][f"{q_index}.buzzRate.{category}"] = buzz_rate
-                processed_update_args["$set"][f"{q_index}.buzzAccuracy.{category}"] = buzz_accuracy
-
-            projected_played = old_question_stats["played"]["all"] + totals["played"]
-            projected_buzzed = old_question_stats["buzzed"]["all"] + totals["buzzed"]
-            projected_correct = old_question_stats["correct"]["all"] + totals["correct"]
-
-            if projected_played == 0:
-                buzz_rate = None
-            else:
-                buzz_rate = projected_buzzed / projected_played
+                    increments[f"{q_index}.cumulativeProgressOnBuzz.{field}.{category}"] = value
+                increments[f"{q_index}.cumulativeProgressOnBuzz.{field}.all"] = sum(categorical_values.values())
+                progress_categories[field] = ["all", *categorical_values]
 
-            if projected_buzzed == 0:
-                buzz_accuracy = None
-            else:
-                buzz_accuracy = projected_correct / projected_buzzed
-
-            processed_update_args["$set"][f"{q_index}.buzzRate.all"] = buzz_rate
-            processed_update_args["$set"][f"{q_index}.buzzAccuracy.all"] = buzz_accuracy
-            app.logger.info("Successfully calculated derived question statistics")
-
-            # Calculate win rate for each category
-            app.logger.info("Calculating win rates...")
-            for category in categories:
-                projected_won = old_game_stats["won"][category] + int(update_args["won"])
-                projected_played = old_game_stats["played"][category] + 1
-                win_rate = projected_won / projected_played
-                processed_update_args["$set"][f"{g_index}.winRate.{category}"] = win_rate
-
-            projected_won = old_game_stats["won"]["all"] + int(update_args["won"])
-            projected_played = old_game_stats["played"]["all"] + 1
-            win_rate = projected_won / projected_played
-            processed_update_args["$set"][f"{g_index}.winRate.all"] = win_rate
-            app.logger.info("Successfully calculated win rates")
-
-            _debug_variable(f"processed_update_args.{username}", processed_update_args)
-
-            update_batch.append(UpdateOne({"username": username}, processed_update_args))
-        _debug_variable("update_batch", update_batch)
+            app.logger.info("Adding incrementation arguments for fields in game stats...")
+            finished = int(update_args["finished"])
+            won = int(update_args["won"])
+            for category in game_categories:
+                increments[f"{g_index}.played.{category}"] = 1
+                increments[f"{g_index}.finished.{category}"] = finished
+                increments[f"{g_index}.won.{category}"] = won
+
+            pipeline = [
+                _increment_stage(increments),
+                _derived_stats_stage(
+                    mode,
+                    ["all", *question_stats["played"]],
+                    progress_categories,
+                    game_categories
+                )
+            ]
+            _debug_variable(f"pipeline.{username}", pipeline)
+            update_batch.append(UpdateOne({"username": username}, pipeline))
 
         if update_batch:
             app.logger.info("Sending bulk write operation...")
-            results = qtpm.users.bulk_write(update_batch)
+            results = qtpm.users.bulk_write(update_batch, ordered=False)
             app.logger.info(f"Matched {results.matched_count} documents and modified {results.modified_count} documents")
             app.logger.info(f"Request body contained profile updates for {len(session_results['users'])} users")
             return {"successful": results.matched_count, "requested": len(session_results["users"])}
@@ -1298,6 +1326,70 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
             app.logger.info("Bulk write operation is empty. Skipping")
             return {"successful": 0, "requested": 0}
 
+    def _increment_stage(increments: Dict[str, Union[int, float]]) -> dict:
+        """
+        Create an update pipeline stage that adds to numeric fields, treating missing fields as 0.
+
+        :param increments: A dictionary mapping field paths to the values to add to them
+        :return: A "$set" stage for an update pipeline
+        """
+        return {"$set": {
+            path: {"$add": [{"$ifNull": [f"${path}", 0]}, {"$literal": value}]} for path, value in increments.items()
+        }}
+
+    def _ratio(numerator_path: str, denominator_path: str) -> dict:
+        """
+        Create an aggregation expression that divides one field by another. Evaluates to null if the denominator is 0.
+
+        :param numerator_path: The path to the field to use as the numerator
+        :param denominator_path: The path to the field to use as the denominator
+        :return: The aggregation expression
+        """
+        denominator = {"$ifNull": [f"${denominator_path}", 0]}
+        return {"$cond": [
+            {"$eq": [denominator, 0]},
+            None,
+            {"$divide": [{"$ifNull": [f"${numerator_path}", 0]}, denominator]}
+        ]}
+
+    def _derived_stats_stage(mode: str,
+                             question_categories: List[str],
+                             progress_categories: Dict[str, List[str]],
+                             game_categories: List[str]) -> dict:
+        """
+        Create an update pipeline stage that recalculates the derived statistics of a user from their counters. Must
+        come after the stage that updates the counters.
+
+        :param mode: The game mode of the statistics
+        :param question_categories: The categories to calculate the buzz rate and buzz accuracy of
+        :param progress_categories: A dictionary mapping each "cumulativeProgressOnBuzz" field to the categories to
+                                    calculate the average of
+        :param game_categories: The categories to calculate the win rate of
+        :return: A "$set" stage for an update pipeline
+        """
+        q_index = f"stats.{mode}.questions"
+        g_index = f"stats.{mode}.game"
+        derived_stats = {}
+        for category in question_categories:
+            derived_stats[f"{q_index}.buzzRate.{category}"] = _ratio(
+                f"{q_index}.buzzed.{category}", f"{q_index}.played.{category}"
+            )
+            derived_stats[f"{q_index}.buzzAccuracy.{category}"] = _ratio(
+                f"{q_index}.correct.{category}", f"{q_index}.buzzed.{category}"
+            )
+
+        for field, categories in progress_categories.items():
+            for category in categories:
+                derived_stats[f"{q_index}.avgProgressOnBuzz.{field}.{category}"] = _ratio(
+                    f"{q_index}.cumulativeProgressOnBuzz.{field}.{category}", f"{q_index}.played.{category}"
+                )
+
+        for category in game_categories:
+            derived_stats[f"{g_index}.winRate.{category}"] = _ratio(
+                f"{g_index}.won.{category}", f"{g_index}.played.{category}"
+            )
+        return {"$set": derived_stats}
+
     @app.post("/backend/key")
     def generate_secret_key():
         """
@@ -1336,9 +1428,7 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
         audio_doc = qtpm.audio.find_one({"_id": audio_id}, {"vtt": 1})
         if audio_doc is None or audio_doc.get("vtt") is None:
             abort(HTTPStatus.NOT_FOUND)
-        response = make_response(bytes(audio_doc["vtt"], "utf-8"))
-        response.headers["Content-Type"] = "application/octet-stream"
-        return response
+        return Response(audio_doc["vtt"], mimetype="application/octet-stream")
 
     @app.route("/leaderboard", methods=["GET"])
     def get_leaderboard():
@@ -1348,8 +1438,8 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
         :return: A dictionary containing the "results"
         """
         category = request.args.get("category") or "all"
-        arg_size = request.args.get("size")
-        size = arg_size or app.config["DEFAULT_LEADERBOARD_SIZE"]
+        # A size of 0 would remove the limit on the query, so fall back to the default for it as well.
+        size = request.args.get("size", type=int) or app.config["DEFAULT_LEADERBOARD_SIZE"]
         if size > app.config["MAX_LEADERBOARD_SIZE"]:
             return _make_err_response(
                 f"Given size exceeds allowable limit ({app.config['MAX_LEADERBOARD_SIZE']})",
@@ -1358,6 +1448,16 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
                 ["exceeds_value", app.config["MAX_LEADERBOARD_SIZE"]],
                 True
             )
+        return {"results": leaderboard_cache.get_or_load((category, size), lambda: _find_leaders(category, size))}
+
+    def _find_leaders(category: str, size: int) -> List[dict]:
+        """
+        Find the basic profiles of the players with the highest ratings in a category.
+
+        :param category: The category of the ratings to sort by
+        :param size: The maximum number of profiles to find
+        :return: A list of the profiles, sorted by rating in descending order
+        """
         visibility_config = app.config["VISIBILITY_CONFIGS"]["basic"]
         cursor = qtpm.database.get_collection(visibility_config["collection"]).find(
             {f"ratings.{category}": {"$exists": True}},
@@ -1365,7 +1465,7 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
             limit=size,
             projection=visibility_config["projection"]
         )
-        return {"results": [doc for doc in cursor]}
+        return [doc for doc in cursor]
 
     @app.route("/leaderboard/audio", methods=["GET"])
     def get_audio_leaderboard():
@@ -1375,8 +1475,15 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
         :return: A dictionary containing the "results"
         """
         visibility_config = app.config["VISIBILITY_CONFIGS"]["basic"]
-        arg_size = request.args.get("size")
-        size = arg_size or app.config["DEFAULT_LEADERBOARD_SIZE"]
+        size = request.args.get("size", type=int) or app.config["DEFAULT_LEADERBOARD_SIZE"]
+        if size > app.config["MAX_LEADERBOARD_SIZE"]:
+            return _make_err_response(
+                f"Given size exceeds allowable limit ({app.config['MAX_LEADERBOARD_SIZE']})",
+                "invalid_arg",
+                HTTPStatus.BAD_REQUEST,
+                ["exceeds_value", app.config["MAX_LEADERBOARD_SIZE"]],
+                True
+            )
         cursor = qtpm.database.get_collection(visibility_config["collection"]).find(
             {f"numRecs": {"$exists": True, "$gt": 0}},
             sort=[(f"numRecs", pymongo.DESCENDING)],
@@ -1393,7 +1500,12 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
         :param pointer: A pointer retrieved from pre_screen
         :return: A document containing the name, status, and other information of a submission
         """
-        status_doc = _get_ps_doc(pointer=pointer)
+        with prescreen_lock:
+            status_doc = _get_ps_doc(pointer=pointer)
+            # Copy while holding the lock so that the consumer thread cannot change the status mid-response.
+            if status_doc is not None:
+                result = status_doc.to_dict()
+                expiry = status_doc.expiry
         if status_doc is None:
             app.logger.error(f"No such resource for pointer '{pointer}'. Aborting")
             return _make_err_response(
@@ -1401,16 +1513,13 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
                 "resource_not_found",
                 HTTPStatus.NOT_FOUND
             )
-        if datetime.now() > status_doc["expiry"]:
+        if time.monotonic_ns() > expiry:
             app.logger.error(f"Resource for pointer '{pointer}' has expired. Aborting")
             return _make_err_response(
                 "The resource to access the status of this submission has expired.",
                 "expired_resource",
                 HTTPStatus.NOT_FOUND
             )
-        _update_prescreen_statuses()
-        result = status_doc.copy()
-        del result["expiry"]
         return result
 
     @app.route("/profile", methods=["GET", "POST", "PATCH", "DELETE"])
@@ -1454,16 +1563,14 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
                     True
                 )
 
-            char_set = app.config["USERNAME_CHAR_SET"]
-            for char in args["username"]:
-                if char not in char_set:
-                    return _make_err_response(
-                        f"Username contains characters outside char set: {char_set}",
-                        "invalid_args",
-                        HTTPStatus.BAD_REQUEST,
-                        ["username", "outside_char_set", "alphanumeric"],
-                        True
-                    )
+            if not username_pattern.fullmatch(args["username"]):
+                return _make_err_response(
+                    f"Username contains characters outside char set: {app.config['USERNAME_CHAR_SET']}",
+                    "invalid_args",
+                    HTTPStatus.BAD_REQUEST,
+                    ["username", "outside_char_set", "alphanumeric"],
+                    True
+                )
 
             try:
                 result = qtpm.create_profile(user_id, args["pfp"], args["username"])
@@ -1492,13 +1599,12 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
                 HTTPStatus.INTERNAL_SERVER_ERROR
             )
         elif request.method == "PATCH":
-            path, op = api.path_for("modify_profile")
             update_args = request.get_json()
-            schema = api.build_schema(api.api["paths"][path][op]["requestBody"]["content"]["application/json"]["schema"])
-            err = _validate_args(update_args, schema)
+            err = _validate_args(update_args, modify_profile_validator)
             if err:
                 return err
 
+            old_profile = qtpm.users.find_one({"_id": user_id}, {"_id": 0, "username": 1})
             try:
                 result = qtpm.modify_profile(user_id, update_args)
             except UsernameTakenError as e:
@@ -1509,6 +1615,8 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
                     [str(e)],
                     True
                 )
+            if old_profile:
+                _forget_cached_profile(old_profile.get("username"))
 
             if result.matched_count == 1:
                 app.logger.info("User profile successfully modified")
@@ -1521,7 +1629,10 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
                 True
             )
         elif request.method == "DELETE":
+            old_profile = qtpm.users.find_one({"_id": user_id}, {"_id": 0, "username": 1})
             result = qtpm.delete_profile(user_id)
+            if old_profile:
+                _forget_cached_profile(old_profile.get("username"))
             if result.deleted_count == 1:
                 app.logger.info("User profile successfully deleted")
                 return '', HTTPStatus.OK
@@ -1545,16 +1656,23 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
         DELETE: Remove the profile
         """
         _debug_variable("username", username)
+        if request.method == "GET":
+            visibility = "basic" if _query_flag("basic") else "public"
+            profile = profile_cache.get_or_load(
+                (visibility, username), lambda: _find_profile_by_username(username, visibility)
+            )
+            if profile is None:
+                abort(HTTPStatus.NOT_FOUND)
+            return profile
+
         other_user_profile = qtpm.users.find_one({"username": username}, {"_id": 1})
         if not other_user_profile:
             abort(HTTPStatus.NOT_FOUND)
         other_user_id = other_user_profile["_id"]
-        if request.method == "GET":
-            visibility = "basic" if _query_flag("basic") else "public"
-            return qtpm.get_profile(other_user_id, visibility)
-        elif request.method == "PATCH":
+        if request.method == "PATCH":
             update_args = request.get_json()
             result = qtpm.modify_profile(other_user_id, update_args)
+            _forget_cached_profile(username)
             if result.matched_count == 1:
                 app.logger.info("User profile successfully modified")
                 return '', HTTPStatus.OK
@@ -1567,6 +1685,7 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
             )
         elif request.method == "DELETE":
             result = qtpm.delete_profile(other_user_id)
+            _forget_cached_profile(username)
             if result.deleted_count == 1:
                 app.logger.info("User profile successfully deleted")
                 return '', HTTPStatus.OK
@@ -1578,13 +1697,36 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
                 True
             )
 
+    def _forget_cached_profile(username: Optional[str]):
+        """
+        Remove the cached profiles of a user after it was modified or deleted. Only profiles that were found are
+        cached, so a new username never has an entry to remove.
+
+        :param username: The username of the user before the change
+        """
+        for visibility in ["basic", "public"]:
+            profile_cache.pop((visibility, username))
+
+    def _find_profile_by_username(username: str, visibility: str) -> Optional[dict]:
+        """
+        Retrieve the profile of a user by their username.
+
+        :param username: The username of the user
+        :param visibility: How much of the profile to show. Valid values are "basic", "public", and "private"
+        :return: The profile, or None if there is no user with the given username
+        """
+        user_doc = qtpm.users.find_one({"username": username}, {"_id": 1})
+        if user_doc is None:
+            return None
+        return qtpm.get_profile(user_doc["_id"], visibility)
+
     @app.route("/profile/<username>/history", methods=["GET"])
     def get_game_history(username):
         """Retrieve the game history of a given username, optionally only including games from "start" to "end"."""
         index_range_arg = request.args.get("iRange")
 
         if index_range_arg:
-            index_range = [int(num) for num in re.split(r",\s*", index_range_arg)]
+            index_range = [int(num) for num in INDEX_RANGE_SEPARATOR_REGEX.split(index_range_arg)]
 
             if len(index_range) != 2:
                 return _make_err_response(
@@ -1598,20 +1740,43 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
             start = index_range[0]
             end = index_range[1] + 1
         else:
-            start = request.args.get("start")
-            end = request.args.get("end")
+            start = request.args.get("start", type=int)
+            end = request.args.get("end", type=int)
+            if end is not None:
+                end += 1
 
-            if start is not None and start != "":
-                start = int(start)
-            else:
-                start = None
+        pipeline = [
+            {"$match": {"username": username}},
+            {"$project": {"hasHistory": {"$isArray": "$history"}, "history": 1}},
+            {"$unwind": {"path": "$history", "preserveNullAndEmptyArrays": True}},
+            # post_game stores dates zero-padded in GAME_DATE_FORMAT, so sorting them as strings also sorts them
+            # chronologically. Older sessions may need maintenance/normalize_game_dates.py for this to hold.
+            {"$sort": {"history.date": pymongo.DESCENDING}},
+            {"$group": {
+                "_id": "$_id",
+                "hasHistory": {"$first": "$hasHistory"},
+                "history": {"$push": "$history"},
+                "numMissingDates": {"$sum": {"$cond": [
+                    {"$and": [
+                        {"$eq": [{"$type": "$history"}, "object"]},
+                        {"$eq": [{"$type": "$history.date"}, "missing"]}
+                    ]},
+                    1,
+                    0
+                ]}}
+            }}
+        ]
 
-            if end is not None and end != "":
-                end = int(end) + 1
-            else:
-                end = None
+        # Negative indices depend on the length of the history, so leave those ranges to Python.
+        slice_in_db = (start is None or start >= 0) and (end is None or end >= 0)
+        slice_size = None
+        if slice_in_db and (start is not None or end is not None):
+            skip = start or 0
+            slice_size = end - skip if end is not None else 2 ** 31 - 1
+            if slice_size > 0:
+                pipeline.append({"$set": {"history": {"$slice": ["$history", skip, slice_size]}}})
 
-        user_profile = qtpm.users.find_one({"username": username}, {"history": 1})
+        user_profile = next(qtpm.users.aggregate(pipeline), None)
 
         if not user_profile:
             return _make_err_response(
@@ -1622,7 +1787,7 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
                 True
             )
 
-        if "history" not in user_profile:
+        if not user_profile["hasHistory"]:
             return _make_err_response(
                 f"Game history not found for user with username '{username}'",
                 "history_not_found",
@@ -1631,19 +1796,21 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
                 True
             )
 
-        history = user_profile["history"]
-        try:
-            history.sort(reverse=True, key=lambda session: datetime.strptime(session["date"], "%Y %m %d %H %M %S"))
-        except KeyError as e:
-            app.logger.exception("Encountered a KeyError while acquiring game history")
+        if user_profile["numMissingDates"]:
+            app.logger.error("Found a game session without a 'date' field while acquiring game history")
             return _make_err_response(
-                f"Field {e} not found",  # No quotes because KeyError message already contains them
+                "Field 'date' not found",
                 "field_not_found",
                 HTTPStatus.INTERNAL_SERVER_ERROR,
-                [str(e)]
+                ["'date'"]
             )
 
-        return {"results": history[start:end]}
+        history = user_profile["history"]
+        if not slice_in_db:
+            history = history[start:end]
+        elif slice_size is not None and slice_size <= 0:
+            history = []
+        return {"results": history}
 
     @app.route("/question", methods=["GET"])
     def pick_game_question():
@@ -1651,7 +1818,7 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
         best evaluations possible without getting recordings from different users in the same question."""
         categories = request.args.getlist("category")
         difficulty_range_arg = request.args.get("difficultyRange")
-        batch_size = int(request.args.get("batchSize") or 1)
+        batch_size = request.args.get("batchSize", type=int) or 1
         pipeline = [
             {'$group': {'_id': '$qb_id', 'category': {'$first': '$category'}}},
             {'$match': {'$expr': {'$not': {'$eq': ['$_id', None]}}}},
@@ -1661,7 +1828,17 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
                 'as': 'audio',
                 'let': {'qb_id': '$_id'},
                 'pipeline': [
-                    {'$match': {'$expr': {'$eq': ['$qb_id', '$$qb_id']}, 'recType': 'normal'}}
+                    {'$match': {'$expr': {'$eq': ['$qb_id', '$$qb_id']}, 'recType': 'normal'}},
+                    # Only return the fields that _pick_audio uses.
+                    {'$project': {
+                        'vtt': 1,
+                        'oldVtt': 1,
+                        'sentenceId': 1,
+                        'tokenizationId': 1,
+                        'batchUUID': 1,
+                        'upvotes': 1,
+                        'downvotes': 1
+                    }}
                 ]
             }}
         ]
@@ -1700,9 +1877,9 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
         POST: Upload a batch of unrecorded questions.
         """
         if request.method == "GET":
-            difficulty = request.args.get("difficultyType")
-            batch_size = request.args.get("batchSize")
-            return pick_recording_question(int(difficulty) if difficulty else difficulty, int(batch_size or 1))
+            difficulty = request.args.get("difficultyType", type=int)
+            batch_size = request.args.get("batchSize", type=int) or 1
+            return pick_recording_question(difficulty, batch_size)
         elif request.method == "POST":
             arguments_batch = request.get_json()
             return upload_questions(arguments_batch)
@@ -1725,31 +1902,6 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
         #
         # cursor = qtpm.unrec_questions.find(query, {"qb_id": 1})
 
-        def _get_difficulty_bounds(collection: str, difficulty: int, query: dict) -> Tuple[int, int]:
-            """
-            Get the boundaries from the configured difficulty distribution for the given difficulty.
-
-            Assumes that the documents to find are sorted in ascending order by ``recDifficulty``.
-
-            :param collection: The collection to look in
-            :param difficulty: An integer representing the index of the configured difficulty distribution
-            :param query: The MongoDB filter to use when scaling the distribution percentages to the number of
-                          documents.
-            :return: A tuple containing the number of documents to skip and the number of documents to stop at
-            """
-            skip_percent = 0
-            limit_percent = 0
-            for i in range(0, difficulty):
-                skip_percent += app.config["DIFFICULTY_DIST"][i]
-            for i in range(0, difficulty + 1):
-                limit_percent += app.config["DIFFICULTY_DIST"][i]
-            doc_count = qtpm.database.get_collection(collection).count_documents(query)
-            skip = int(skip_percent * doc_count)
-            limit = int(limit_percent * doc_count)
-            _debug_variable("skip_percent", skip_percent)
-            _debug_variable("limit_percent", limit_percent)
-            return skip, limit
-
         query = {
             "qb_id": {"$exists": True},
             "recDifficulty": {"$exists": True}
@@ -1763,24 +1915,17 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
                     HTTPStatus.BAD_REQUEST,
                     log_msg=True
                 )
-            skip_unrec, limit_unrec = _get_difficulty_bounds("UnrecordedQuestions", difficulty, query)
-            skip_rec, limit_rec = _get_difficulty_bounds("RecordedQuestions", difficulty, query)
+            unrec_query = {**query, "recDifficulty": _get_difficulty_query_op(qtpm.unrec_questions, difficulty)}
+            rec_query = {**query, "recDifficulty": _get_difficulty_query_op(qtpm.rec_questions, difficulty)}
         else:
-            skip_unrec, limit_unrec = 0, 0
-            skip_rec, limit_rec = 0, 0
-
-        # Get IDs for unrecorded questions
-        unrec_cursor = qtpm.unrec_questions.find(
-            query, {"qb_id": 1},
-            skip=skip_unrec, limit=limit_unrec, sort=[("recDifficulty", pymongo.ASCENDING)]
-        )
+            unrec_query = query
+            rec_query = query
 
-        rec_cursor = qtpm.rec_questions.find(
-            query, {"qb_id": 1},
-            skip=skip_rec, limit=limit_rec, sort=[("recDifficulty", pymongo.ASCENDING)]
-        )
+        # Deduplicate on the database side; segmented questions share a qb_id.
+        unrec_qids = qtpm.unrec_questions.distinct("qb_id", unrec_query)
+        rec_qids = qtpm.rec_questions.distinct("qb_id", rec_query)
 
-        question_ids = list({doc["qb_id"] for doc in chain(unrec_cursor, rec_cursor)})  # Ensure no duplicates are present
+        question_ids = list(set(unrec_qids).union(rec_qids))  # A question can be in both collections
         if not question_ids:
             return _make_err_response(
                 f"No questions found for difficulty type '{difficulty}'",
@@ -1808,12 +1953,60 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
             results.append(result_doc)
         return {"results": results, "errors": errors}
 
+    def _get_difficulty_query_op(collection: pymongo.collection.Collection, difficulty: int) -> dict:
+        """
+        Get a query operator that matches the ``recDifficulty`` values of the given difficulty type in a collection.
+
+        :param collection: The collection of questions to look in
+        :param difficulty: An integer representing the index of the configured difficulty distribution
+        :return: A MongoDB query operator for the "recDifficulty" field
+        """
+        boundaries = difficulty_bounds_cache.get_or_load(
+            collection.name, lambda: _find_difficulty_boundaries(collection)
+        )
+        query_op = {"$exists": True}
+        lower_bound = boundaries[difficulty]
+        upper_bound = boundaries[difficulty + 1]
+        if lower_bound is not None:
+            query_op["$gte"] = lower_bound
+        if upper_bound is not None:
+            query_op["$lt"] = upper_bound
+        return query_op
+
+    def _find_difficulty_boundaries(collection: pymongo.collection.Collection) -> List[Optional[float]]:
+        """
+        Find the ``recDifficulty`` values that split the questions of a collection into the configured difficulty
+        distribution.
+
+        :param collection: The collection of questions to look in
+        :return: A list where difficulty type ``i`` covers the values from index ``i`` (inclusive) to ``i + 1``
+                 (exclusive). ``None`` means that the range is unbounded on that side.
+        """
+        query = {
+            "qb_id": {"$exists": True},
+            "recDifficulty": {"$exists": True}
+        }
+        doc_count = collection.count_documents(query)
+        boundaries = [None]
+        cumulative_percent = 0
+        for percent in app.config["DIFFICULTY_DIST"][:-1]:
+            cumulative_percent += percent
+            doc = next(collection.find(
+                query, {"_id": 0, "recDifficulty": 1},
+                sort=[("recDifficulty", pymongo.ASCENDING)], skip=int(cumulative_percent * doc_count), limit=1
+            ), None)
+            boundaries.append(doc["recDifficulty"] if doc else float("inf"))
+        boundaries.append(None)
+        _debug_variable(f"difficulty_boundaries.{collection.name}", boundaries)
+        return boundaries
+
     def upload_questions(arguments_batch: Dict[str, List[dict]]) -> Tuple[Union[str, dict], int]:
         """
         Upload a batch of unrecorded questions.
 
         :param arguments_batch: A dictionary containing the list of "arguments"
-        :return: A dictionary containing a "msg" stating that the upload was successful if nothing went wrong
+        :return: Nothing if every question was uploaded. Otherwise, a dictionary containing the number of "successful"
+                 and "requested" uploads, and the "errors" of the questions that failed
         """
         if arguments_batch is None:
             return _make_err_response(
@@ -1825,8 +2018,25 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
         arguments_list = arguments_batch["arguments"]
         _debug_variable("arguments_list", arguments_list)
 
+        # Normalize answers once here instead of on every call to check_answer.
+        for arguments in arguments_list:
+            if "answer" in arguments:
+                arguments["normalizedAnswer"] = utils.default_process(arguments["answer"])
+
         app.logger.info(f"Uploading {len(arguments_list)} unrecorded question(s)...")
-        results = qtpm.unrec_questions.insert_many(arguments_list)
+        try:
+            results = qtpm.unrec_questions.insert_many(arguments_list, ordered=False)
+        except pymongo.errors.BulkWriteError as e:
+            # The insertion is unordered, so every question without an error was still stored. Report a success so that
+            # clients do not retry the whole batch and duplicate those questions.
+            write_errors = e.details["writeErrors"]
+            app.logger.info(f"Successfully uploaded {e.details['nInserted']} question(s)")
+            app.logger.error(f"Failed to upload {len(write_errors)} of {len(arguments_list)} question(s)")
+            return {
+                "successful": e.details["nInserted"],
+                "requested": len(arguments_list),
+                "errors": [{"index": err["index"], "msg": err["errmsg"]} for err in write_errors]
+            }, HTTPStatus.OK
         app.logger.info(f"Successfully uploaded {len(results.inserted_ids)} question(s)")
         return '', HTTPStatus.OK
 
@@ -1843,23 +2053,22 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
             )
         uid = args["userId"]
 
-        user = qtpm.users.find_one({"_id": uid})
-        rec_votes = user.get("recVotes") or []
-        has_voted = False
-        for i, rec_vote in enumerate(rec_votes):
-            if rec_vote["id"] == audio_id:
-                has_voted = True
-                if rec_vote["vote"] == 1:  # Avoid upvoting twice.
-                    return '', HTTPStatus.OK
-                else:
-                    qtpm.users.update_one({"_id": uid}, {"$set": {f"recVotes.{i}.vote": 1}})
-                    qtpm.audio.update_one({"_id": audio_id}, {"$inc": {"downvotes": -1}})
-                    break
-
-        if not has_voted:
-            qtpm.users.update_one({"_id": uid}, {"$push": {"recVotes": {"id": audio_id, "vote": 1}}})
+        prev_vote = _set_rec_vote(uid, audio_id, 1)
+        if prev_vote is None:
+            return _make_err_response(
+                f"No such user: {uid}",
+                "user_not_found",
+                HTTPStatus.NOT_FOUND,
+                [uid],
+                True
+            )
+        if prev_vote == 1:  # Avoid upvoting twice.
+            return '', HTTPStatus.OK
 
-        result = qtpm.audio.update_one({"_id": audio_id}, {"$inc": {"upvotes": 1}})
+        vote_increments = {"upvotes": 1}
+        if prev_vote == -1:
+            vote_increments["downvotes"] = -1
+        result = qtpm.audio.update_one({"_id": audio_id}, {"$inc": vote_increments})
 
         if result.matched_count == 0:
             return _make_err_response(
@@ -1945,7 +2154,7 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
         app.logger.info("Writing metadata...")
         _debug_variable("metadata", metadata)
         with open(submission_path + ".json", "w") as meta_f:
-            meta_f.write(bson.json_util.dumps(metadata))
+            meta_f.write(sv_util.dumps_extended_json(metadata))
         app.logger.info("Successfully wrote metadata")
         return submission_name
 
@@ -1958,12 +2167,13 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
         :return: The list of submission names generated in the same order as the "submissions" argument, which will each
                  have a batch number appended
         """
+        if not submissions:
+            return []
         app.logger.info("Saving recordings...")
         base_submission_name = _get_next_submission_name()
         _debug_variable("base_submission_name", base_submission_name)
-        submission_names = []
 
-        for i, submission in enumerate(submissions):
+        def save_submission(i: int, submission: Tuple[werkzeug.datastructures.FileStorage, dict]) -> str:
             recording, metadata = submission
             app.logger.info("Saving audio...")
             submission_name = f"{base_submission_name}_b{i}"
@@ -1975,9 +2185,13 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
             app.logger.info("Writing metadata...")
             _debug_variable("metadata", metadata)
             with open(submission_path + ".json", "w") as meta_f:
-                meta_f.write(bson.json_util.dumps(metadata))
+                meta_f.write(sv_util.dumps_extended_json(metadata))
             app.logger.info("Successfully wrote metadata")
-            submission_names.append(submission_name)
+            return submission_name
+
+        # Overlap the disk writes of the submissions. map() keeps the names in the order of the submissions.
+        with ThreadPoolExecutor(max_workers=min(MAX_SAVE_WORKERS, len(submissions))) as executor:
+            submission_names = list(executor.map(save_submission, range(len(submissions)), submissions))
 
         return submission_names
 
@@ -2010,9 +2224,16 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
         if id_token.startswith(prefix):
             id_token = id_token[len(prefix):]
 
+        token_hash = hashlib.blake2b(id_token.encode(), digest_size=16).digest()
+        decoded = id_token_cache.get(token_hash)
+        if decoded is not None and decoded["exp"] > time.time():
+            app.logger.info("Using cached decoded token")
+            return decoded
+
         try:
             app.logger.info("Decoding token...")
             decoded = auth.verify_id_token(id_token)
+            id_token_cache.set(token_hash, decoded)
         except (auth.InvalidIdTokenError, auth.ExpiredIdTokenError) as e:
             app.logger.error(f"ID token error encountered: {e!r}. Aborting")
             decoded = None
@@ -2064,7 +2285,7 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
         :param original: The original value
         :return: The original value, or "[REDACTED]"
         """
-        if app.config["LOG_PRIVATE_DATA"]:
+        if log_private_data:
             return original
         return "[REDACTED]"
 
@@ -2076,27 +2297,25 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
         :param flag: The name of the flag
         :return: Whether the flag is present
         """
-        return request.args.get(flag) is not None
+        return flag in request.args
 
-    def _validate_args(args: dict, schema: dict) -> Optional[Tuple[str, int]]:
+    def _validate_args(args: dict, validator: OAS30Validator) -> Optional[Tuple[str, int]]:
         """
         Shortcut for logic flow of schema validation when handling requests.
 
         :param args: The value to validate
-        :param schema: The schema to use
+        :param validator: The validator of the schema to use. Stops at the first error found
         :return: An error response if the schema is invalid
         """
-        try:
-            validate(args, schema)
-            err = None
-        except jsonschema.exceptions.ValidationError as e:
-            app.logger.error(f"Request arguments do not match schema: {e}")
-            err = _make_err_response(
-                f"Request arguments do not match schema: {e}",
-                "validation_error",
-                HTTPStatus.BAD_REQUEST
-            )
-        return err
+        e = next(validator.iter_errors(args), None)
+        if e is None:
+            return None
+        logger.error(f"Request arguments do not match schema: {e}")
+        return _make_err_response(
+            f"Request arguments do not match schema: {e}",
+            "validation_error",
+            HTTPStatus.BAD_REQUEST
+        )
 
     def _debug_variable(name: str, v, include_type=False, private=False):
         """
@@ -2107,6 +2326,8 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
         :param include_type: Whether to include the type() of the variable
         :param private: Whether to redact the value when configured
         """
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
         if private:
             val = _get_private_data_string(v)
         else:
@@ -2115,53 +2336,70 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
             prefix = f"{type(v)} "
         else:
             prefix = ""
-        val_pp = pprinter.pformat(val)
-        app.logger.debug(f"{prefix}{name} = {val_pp}")
-
-    def _update_prescreen_statuses():
-        """Update the status of all submissions in the status resource with the results from the queue and remove
-        expired resources."""
-        # Update statuses from queue.
-        # TODO: Maybe do this in batches
+        logger.debug("%s%s = %s", prefix, name, sv_util.LazyStr(lambda: pprinter.pformat(val)))
+
+    def _consume_prescreen_results():
+        """
+        Apply the results of the pre-screening process to the pre-screen statuses as they arrive, and remove expired
+        statuses at least every ``PRESCREEN_POLL_INTERVAL`` seconds. Runs in a background thread for the lifetime of
+        the server.
+        """
         while True:
             try:
-                result = prescreen_results_queue.get(block=False)
-                _debug_variable("queue.get()", result)
+                results = [prescreen_results_queue.get(timeout=PRESCREEN_POLL_INTERVAL)]
             except queue.Empty:
-                break
+                results = []
+            results += _drain_prescreen_results()
+            with prescreen_lock:
+                _update_prescreen_statuses(results)
+
+    def _update_prescreen_statuses(results: list):
+        """
+        Update the status of all submissions in the status resource with the given results and remove expired
+        resources. Requires ``prescreen_lock`` to be held.
+
+        :param results: The results taken from the pre-screen results queue
+        """
+        for result in results:
+            _debug_variable("queue.get()", result)
+            if isinstance(result, rec_processing.PrescreenFailure):
+                outcomes = [rec_processing.PrescreenResult(name, "err", "internal_error") for name in result.names]
             else:
-                if type(result) is tuple and isinstance(result[1], Exception):
-                    for submission in result[0]:
-                        ps_doc = _get_ps_doc(name=submission)
-                        if ps_doc is None:
-                            app.logger.debug(f"No pointer found for submission '{submission}'. Ignoring")
-                            continue
-                        _debug_variable("ps_doc", ps_doc)
-                        ps_doc["status"] = "err"
-                        ps_doc["err"] = "internal_error"
-                        # ps_doc["extra"] = repr(result[1])
-                else:
-                    ps_doc = _get_ps_doc(name=result["name"])
-                    if ps_doc is None:
-                        app.logger.debug(f"No pointer found for submission '{result['name']}'. Ignoring")
-                        continue
-                    _debug_variable("ps_doc", ps_doc)
-                    if result["case"] == "err":
-                        ps_doc["status"] = "err"
-                        ps_doc["err"] = result["err"]
-                    else:
-                        ps_doc["status"] = "finished"
-                        ps_doc["accepted"] = result["case"] == "accepted"
+                outcomes = [result]
+            for outcome in outcomes:
+                ps_doc = _get_ps_doc(name=outcome.name)
+                if ps_doc is None:
+                    # The result can arrive before pre_screen registers the pointer, so hold it until then.
+                    app.logger.debug(f"No pointer found for submission '{outcome.name}'. Holding result")
+                    unclaimed_prescreen_results[outcome.name] = outcome
+                    expiry = time.monotonic_ns() + PRESCREEN_STATUS_LIFETIME_NS
+                    unclaimed_prescreen_expiries.append((expiry, outcome.name))
+                    continue
+                ps_doc.apply_result(outcome)
+                _debug_variable("ps_doc", ps_doc)
         # Remove expired pointers.
-        now = datetime.now()
-        # A for loop won't delete documents properly.
-        i = 0
-        while i < len(prescreen_statuses):
-            doc = prescreen_statuses[i]
-            if now > doc["expiry"]:
-                prescreen_statuses.remove(doc)
-            else:
-                i += 1
+        now = time.monotonic_ns()
+        while prescreen_expiry_heap and now > prescreen_expiry_heap[0][0]:
+            _, pointer = heapq.heappop(prescreen_expiry_heap)
+            del prescreen_statuses_by_name[prescreen_statuses.pop(pointer).name]
+        while unclaimed_prescreen_expiries and now > unclaimed_prescreen_expiries[0][0]:
+            _, name = unclaimed_prescreen_expiries.popleft()
+            unclaimed_prescreen_results.pop(name, None)
+
+    def _drain_prescreen_results() -> list:
+        """
+        Take every result that is currently in the pre-screen results queue without blocking.
+
+        :return: The results in the order they were put in the queue
+        """
+        results = []
+        get_nowait = prescreen_results_queue.get_nowait
+        try:
+            while True:
+                results.append(get_nowait())
+        except queue.Empty:
+            pass
+        return results
 
     def _get_ps_doc(*, name=None, pointer=None):
         """
@@ -2171,23 +2409,12 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
         :param pointer: The pointer to look up the pre-screen status document by
         :return: The result of the lookup, or None if no result was found
         """
-        k_name = None
-        k_val = None
         if name:
-            k_name = "name"
-            k_val = name
+            return prescreen_statuses_by_name.get(name)
         elif pointer:
-            k_name = "pointer"
-            k_val = pointer
-
-        if k_name is None:
-            raise ValueError("No arguments specified")
+            return prescreen_statuses.get(pointer)
 
-        for doc in prescreen_statuses:
-            if doc[k_name] == k_val:
-                return doc
-
-        return None
+        raise ValueError("No arguments specified")
 
     def _make_err_response(msg: str, id_: str, status_code: int, extra: list = None, log_msg=False):
         """
@@ -2201,7 +2428,7 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
         :return: A tuple containing the JSON response and the status code
         """
         if log_msg:
-            app.logger.error(f"{msg}. Aborting")
+            logger.error(f"{msg}. Aborting")
         response = {
             "err": msg,
             "err_id": id_
@@ -2213,27 +2440,20 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
     def _pick_audio(recs: list):
         weights = []
         rec_choices = []  # Segmented recordings are treated as one item
+        segments = {}  # Recordings that belong to a batch, keyed by batch UUID
         for rec in recs:
+            if "batchUUID" in rec:
+                segments.setdefault(rec["batchUUID"], []).append(rec)
             if "sentenceId" not in rec or rec["sentenceId"] == 0 or "tokenizationId" not in rec or rec["tokenizationId"] == 0:
                 rec_choices.append(rec)
+                upvotes = rec.get("upvotes") or 0
+                downvotes = rec.get("downvotes") or 0
+                weights.append(1.0 if downvotes == 0 or upvotes == 0 else upvotes / downvotes)
 
-        for rec in rec_choices:
-            upvotes = rec.get("upvotes") or 0
-            downvotes = rec.get("downvotes") or 0
-
-            if downvotes == 0 or upvotes == 0:
-                weight = 1.0
-            else:
-                weight = upvotes / downvotes
-
-            weights.append(weight)
-
-        selected = random.choices(rec_choices, weights=weights, k=1)
-        if "batchUUID" in selected[0]:  # Retrieve the other segments if it is segmented
-            batch_uuid = selected[0]["batchUUID"]
-            for rec in recs:
-                if rec.get("batchUUID") == batch_uuid and rec != selected[0]:
-                    selected.append(rec)
+        choice = random.choices(rec_choices, weights=weights, k=1)[0]
+        selected = [choice]
+        if "batchUUID" in choice:  # Retrieve the other segments if it is segmented
+            selected += [rec for rec in segments[choice["batchUUID"]] if rec is not choice]
 
         selected_final = []
         for rec in selected:
@@ -2252,6 +2472,7 @@ def create_app(test_overrides: dict = None, test_inst_path: str = None, test_sto
             selected_final.append(rec_final)
         return selected_final
 
+    threading.Thread(target=_consume_prescreen_results, name="prescreen-consumer", daemon=True).start()
     return app
 
 
@@ -3,6 +3,9 @@ from copy import deepcopy
 
 import yaml
 
+# Parse with the libyaml bindings when PyYAML was built with them. They produce the same result about 10x faster.
+YAML_LOADER = getattr(yaml, "CFullLoader", yaml.FullLoader)
+
 
 class QuizzrAPISpec:
     """A class containing an OpenAPI specification and several utility functions"""
@@ -15,7 +18,8 @@ class QuizzrAPISpec:
         :param api_path: The path to the file
         """
         with open(api_path) as api_f:
-            self.api = yaml.load(api_f.read(), Loader=yaml.FullLoader)
+            self.api = yaml.load(api_f.read(), Loader=YAML_LOADER)
+        self._request_body_schemas = {}
 
     def path_for(self, op_id: str):
         """
@@ -29,6 +33,23 @@ class QuizzrAPISpec:
                 if type(description) is dict and description.get("operationId") == op_id:
                     return path, op
 
+    def request_body_schema(self, op_id: str, content_type="application/json") -> dict:
+        """
+        Return the request body schema of an operation with all references resolved. The schema is only built the
+        first time it is requested for an operation; later calls return the same object, so do not modify it.
+
+        :param op_id: The target value of the "operation_id" field
+        :param content_type: The media type of the request body
+        :return: The resolved schema
+        """
+        key = (op_id, content_type)
+        if key not in self._request_body_schemas:
+            path, op = self.path_for(op_id)
+            self._request_body_schemas[key] = self.build_schema(
+                self.api["paths"][path][op]["requestBody"]["content"][content_type]["schema"]
+            )
+        return self._request_body_schemas[key]
+
     def get_schema_stub(self, schema_name: str):
         """
         Return a copy of the stub example of a schema.
@@ -1,19 +1,104 @@
-import collections.abc
+import threading
+from typing import Any, Callable, Hashable, Optional
 
+import bson.json_util
+import cachetools
+import flask.json
+import orjson
 
-def deep_update(d, u):
+
+class ExpiringCache:
+    """A thread-safe, size-limited cache whose entries expire a fixed number of seconds after being stored."""
+
+    def __init__(self, max_size: int, ttl: float):
+        """
+        :param max_size: The maximum number of entries. The least recently used entry is evicted when full
+        :param ttl: The number of seconds that an entry stays valid for
+        """
+        self._cache = cachetools.TTLCache(max_size, ttl)
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            return self._cache.get(key, default)
+
+    def set(self, key: Hashable, value):
+        with self._lock:
+            self._cache[key] = value
+
+    def pop(self, key: Hashable, default=None):
+        with self._lock:
+            return self._cache.pop(key, default)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Optional[Any]]):
+        """
+        Get the value of an entry, or call the loader and store its result if the entry is missing or expired. A
+        result of ``None`` is returned without being stored so that the next call tries again.
+
+        :param key: The key of the entry
+        :param loader: A function that takes no arguments and returns the value to store
+        :return: The cached or loaded value
+        """
+        value = self.get(key)
+        if value is None:
+            value = loader()
+            if value is not None:
+                self.set(key, value)
+        return value
+
+
+class LazyStr:
+    """
+    Defer building a string until it is needed, such as when a log record that uses it as an argument is formatted.
     """
-    Apply an update operation to a dictionary without overwriting embedded dictionaries.
+    __slots__ = ("_func",)
+
+    def __init__(self, func: Callable[[], str]):
+        """
+        :param func: A function that takes no arguments and returns the string
+        """
+        self._func = func
 
-    Source: https://stackoverflow.com/questions/3232943/update-value-of-a-nested-dictionary-of-varying-depth
+    def __str__(self):
+        return self._func()
+
+
+class ORJSONEncoder(flask.json.JSONEncoder):
+    """
+    A JSON encoder that serializes with orjson. Objects that orjson does not support natively, including datetimes,
+    still go through the default method of the Flask encoder.
+    """
+
+    def encode(self, o) -> str:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if self.indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(o, default=self.default, option=option).decode()
+
+
+class ORJSONDecoder(flask.json.JSONDecoder):
+    """A JSON decoder that deserializes with orjson."""
+
+    def decode(self, s, *args, **kwargs):
+        return orjson.loads(s)
+
+
+def dumps_extended_json(obj) -> str:
+    """
+    Serialize an object to a string that ``bson.json_util.loads`` can read back. Objects made of plain JSON types are
+    serialized with orjson. Anything else, such as an ObjectId or a datetime, falls back to ``bson.json_util.dumps``
+    so that it keeps its MongoDB Extended JSON representation.
 
-    :param d: The base dictionary
-    :param u: The dictionary to merge on top of the base
-    :return: The base dictionary, for recursion purposes
+    :param obj: The object to serialize
+    :return: The JSON string
     """
-    for k, v in u.items():
-        if isinstance(v, collections.abc.Mapping):
-            d[k] = deep_update(d.get(k, {}), v)
-        else:
-            d[k] = v
-    return d
+    try:
+        return orjson.dumps(obj, option=orjson.OPT_PASSTHROUGH_DATETIME).decode()
+    except orjson.JSONEncodeError:
+        return bson.json_util.dumps(obj)
@@ -5,17 +5,21 @@ import pprint
 import random
 from copy import deepcopy
 from datetime import datetime
+from functools import cached_property
 from itertools import chain
-from typing import Dict, Any, List, Tuple, Optional, Union
+from typing import Dict, Any, List, Tuple, Optional, Union, Iterator
 # from secrets import token_urlsafe
 from uuid import uuid4
 
 import pymongo
+import pymongo.errors
 from pymongo import UpdateOne
 from pymongo.collection import Collection
 from pymongo.database import Database
 
 import firebase_admin
+import google.api_core.exceptions
+import google.cloud.storage
 from firebase_admin import credentials, storage
 from pymongo.results import InsertManyResult
 
@@ -40,7 +44,8 @@ class QuizzrTPM:
         self.logger = logger or logging.getLogger(__name__)
         self.config = config
 
-        self.mongodb_client = pymongo.MongoClient(os.environ["CONNECTION_STRING"])
+        self.mongodb_client = pymongo.MongoClient(os.environ["CONNECTION_STRING"],
+                                                  **config.get("MONGO_CLIENT_OPTIONS", {}))
         if type(firebase_app_specifier) is str:
             cred = credentials.Certificate(firebase_app_specifier)
             self.app = firebase_admin.initialize_app(cred, {
@@ -58,9 +63,52 @@ class QuizzrTPM:
         self.unproc_audio: Collection = self.database.UnprocessedAudio
         self.games: Collection = self.database.Games
 
-        self.rec_question_ids = self.get_ids(self.rec_questions)
-        self.unrec_question_ids = self.get_ids(self.unrec_questions)
-        self.user_ids = self.get_ids(self.users)
+    # The cached ID lists require a scan of the entire collection, and only the deprecated wrapper methods use them, so
+    # load them on first access rather than on every startup.
+    @cached_property
+    def rec_question_ids(self) -> list:
+        return self.get_ids(self.rec_questions)
+
+    @cached_property
+    def unrec_question_ids(self) -> list:
+        return self.get_ids(self.unrec_questions)
+
+    @cached_property
+    def user_ids(self) -> list:
+        return self.get_ids(self.users)
+
+    def create_indexes(self):
+        """
+        Create the indexes that the server's frequent lookups rely on. Creating an index that already exists does
+        nothing, so this is safe to call on every startup.
+
+        :raises pymongo.errors.OperationFailure: If a unique index cannot be created, e.g. because of duplicate values
+        """
+        indexes = [
+            # Only usernames that are set must be unique, so that profiles without one do not block the index. "$gt"
+            # only matches strings when compared with a string, and unlike "$type", an equality filter on a username
+            # implies it, so that the query planner can still use the index for lookups by username.
+            (self.users, "username", {"unique": True, "partialFilterExpression": {"username": {"$gt": ""}}}),
+            # Leaderboards filter and sort on the rating of one category, and categories are not known in advance.
+            (self.users, "ratings.$**", {}),
+            (self.users, [("numRecs", pymongo.DESCENDING)], {}),
+            (self.rec_questions, "qb_id", {}),  # Not unique; segmented questions share a qb_id.
+            (self.rec_questions, [("category", pymongo.ASCENDING), ("difficultyNum", pymongo.ASCENDING)], {}),
+            (self.rec_questions, [("recDifficulty", pymongo.ASCENDING), ("qb_id", pymongo.ASCENDING)], {}),
+            (self.unrec_questions, [("recDifficulty", pymongo.ASCENDING), ("qb_id", pymongo.ASCENDING)], {}),
+            (self.audio, [("qb_id", pymongo.ASCENDING), ("recType", pymongo.ASCENDING)], {}),
+            (self.audio, "batchUUID", {"sparse": True})
+        ]
+        for collection, key, kwargs in indexes:
+            try:
+                index_name = collection.create_index(key, **kwargs)
+            except pymongo.errors.OperationFailure as e:
+                self.logger.error(f"Failed to create index {key!r} on collection '{collection.name}': {e}")
+                # The other indexes only speed up lookups, but the server relies on unique indexes for correctness.
+                if kwargs.get("unique"):
+                    raise
+                continue
+            self.logger.info(f"Ensured index '{index_name}' on collection '{collection.name}'")
 
     def update_processed_audio(self, arguments: Dict[str, Any]) -> List[Tuple[str, str]]:
         """
@@ -225,6 +273,44 @@ class QuizzrTPM:
         fh = io.BytesIO(file_bytes)
         return fh
 
+    def find_file_blob(self, blob_path: str) -> google.cloud.storage.Blob:
+        """
+        Retrieve the metadata of a file in Firebase Storage without downloading its contents.
+
+        :param blob_path: The canonical blob name
+        :return: The blob, including its size
+        :raises google.api_core.exceptions.NotFound: If the blob does not exist
+        """
+        blob_name = "/".join([self.config["BLOB_ROOT"], blob_path])
+        self._debug_variable("blob_name", blob_name)
+        blob = self.bucket.get_blob(blob_name)
+        if blob is None:
+            raise google.api_core.exceptions.NotFound(f"Blob '{blob_name}' not found")
+        return blob
+
+    @staticmethod
+    def stream_file_blob(blob: google.cloud.storage.Blob, start: int = 0, end: int = None,
+                         chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """
+        Retrieve a file from Firebase Storage in chunks instead of loading the whole file into memory.
+
+        :param blob: The blob to download, as returned by ``find_file_blob``
+        :param start: The offset of the first byte to download
+        :param end: The offset after the last byte to download. Defaults to the end of the file
+        :param chunk_size: The maximum number of bytes in each chunk
+        :return: A generator of the chunks of the requested part of the file
+        """
+        remaining = (blob.size if end is None else end) - start
+        with blob.open("rb", chunk_size=chunk_size) as f:
+            if start:
+                f.seek(start)
+            while remaining > 0:
+                chunk = f.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
     def delete_file_blob(self, blob_path: str):
         blob_name = "/".join([self.config["BLOB_ROOT"], blob_path])
         self._debug_variable("blob_name", blob_name)
@@ -294,10 +380,10 @@ class QuizzrTPM:
 
         self.logger.info("Finding unrecorded questions...")
         unrec_cursor = self.unrec_questions.find(**kwargs_c)
-        found_unrec_qids = []
+        found_unrec_qids = set()
         for i, question in enumerate(unrec_cursor):
             self._debug_variable(f"question {i}", question)
-            found_unrec_qids.append(question["qb_id"])
+            found_unrec_qids.add(question["qb_id"])
             yield question
         self.logger.info(f"Found {len(found_unrec_qids)} unrecorded question(s)")
 
@@ -311,10 +397,11 @@ class QuizzrTPM:
         else:
             self.logger.info("Finding recorded questions...")
 
-        rec_count = self.rec_questions.count_documents(**kwargs_c)
         rec_cursor = self.rec_questions.find(**kwargs_c)
+        rec_count = 0
         for i, question in enumerate(rec_cursor):
             self._debug_variable(f"question {i}", question)
+            rec_count += 1
             yield question
         self.logger.info(f"Found {rec_count} recorded question(s)")
 
@@ -581,7 +668,7 @@ class QuizzrTPM:
         :raise UserExistsError: When there is an existing user profile with the given username
         :raise pymongo.errors.DuplicateKeyError: When a user of the given ID already exists
         """
-        if self.users.find_one({"username": username}) is not None:
+        if self.users.find_one({"username": username}, {"_id": 0, "username": 1}) is not None:
             raise UsernameTakenError(username)
         profile = {
             "_id": user_id,
@@ -612,7 +699,7 @@ class QuizzrTPM:
         :return: A pymongo UpdateResult object. See documentation for further details
         """
         username = update_args.get("username")
-        if username and self.users.find_one({"username": username}) is not None:
+        if username and self.users.find_one({"username": username}, {"_id": 0, "username": 1}) is not None:
             raise UsernameTakenError(username)
         return self.users.update_one({"_id": user_id}, {"$set": update_args})
 
@@ -686,10 +773,10 @@ class QuizzrTPM:
             "$set": {
                 "avgRating": rating
             }
-        })
+        }, {"userId": 1, "qb_id": 1})
         self._debug_variable("audio_doc", audio_doc)
         user_id = audio_doc["userId"]
-        profile = self.users.find_one({"_id": user_id})
+        profile = self.users.find_one({"_id": user_id}, {"recordedAudios": 1})
         self._debug_variable("profile", profile)
         if not profile:
             raise ProfileNotFoundError(f"'{user_id}'")
@@ -698,7 +785,7 @@ class QuizzrTPM:
         if rec_index is None:
             raise MalformedProfileError(f"Expected recording with ID '{audio_id}' in user profile with ID '{user_id}'")
 
-        question = self.rec_questions.find_one({"qb_id": audio_doc["qb_id"]})
+        question = self.rec_questions.find_one({"qb_id": audio_doc["qb_id"]}, {"recDifficulty": 1})
         self._debug_variable("question", question)
         difficulty = self.get_difficulty_type(question["recDifficulty"])
         self._debug_variable("difficulty", difficulty)
@@ -706,18 +793,29 @@ class QuizzrTPM:
         total_ratings_diff = rating
         num_rated_recs_all = 1
         num_rated_recs_diff = 1
-        for i, rec_doc in enumerate(profile["recordedAudios"]):
-            if "avgRating" not in rec_doc or i == rec_index:
-                continue
+        rated_recs = [rec_doc for i, rec_doc in enumerate(profile["recordedAudios"])
+                      if "avgRating" in rec_doc and i != rec_index]
+
+        # Look up the difficulty of every other rated recording in two queries instead of two per recording.
+        # TODO: Use embedded recording difficulty type
+        rec_qids = {
+            doc["_id"]: doc.get("qb_id")
+            for doc in self.audio.find({"_id": {"$in": [rec_doc["id"] for rec_doc in rated_recs]}}, {"qb_id": 1})
+        }
+        self._debug_variable("rec_qids", rec_qids)
+        # Segmented questions have a document for each segment, so keep the first one for each qb_id, the same one that
+        # find_one would have returned.
+        question_difficulties = {}
+        for doc in self.rec_questions.find(
+                {"qb_id": {"$in": list(set(rec_qids.values()))}}, {"qb_id": 1, "recDifficulty": 1}):
+            if doc["qb_id"] not in question_difficulties:
+                question_difficulties[doc["qb_id"]] = self.get_difficulty_type(doc["recDifficulty"])
+        self._debug_variable("question_difficulties", question_difficulties)
+
+        for rec_doc in rated_recs:
             total_ratings_all += rec_doc["avgRating"]
             num_rated_recs_all += 1
-            # TODO: Use embedded recording difficulty type
-            rec_doc_lookup = self.audio.find_one({"_id": rec_doc["id"]}, {"qb_id": 1})
-            self._debug_variable("rec_doc_lookup", rec_doc_lookup)
-            rec_doc_question = self.rec_questions.find_one({"qb_id": rec_doc_lookup["qb_id"]})
-            self._debug_variable("rec_doc_question", rec_doc_question)
-            rec_doc_difficulty = self.get_difficulty_type(rec_doc_question["recDifficulty"])
-            self._debug_variable("rec_doc_difficulty", rec_doc_difficulty)
+            rec_doc_difficulty = question_difficulties.get(rec_qids.get(rec_doc["id"]))
             if rec_doc_difficulty == difficulty:
                 total_ratings_diff += rec_doc["avgRating"]
                 num_rated_recs_diff += 1
@@ -753,6 +851,8 @@ class QuizzrTPM:
         :param v: The value of the variable
         :param include_type: Whether to include the type() of the variable
         """
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         if include_type:
             prefix = f"{type(v)} "
         else: